@@ -4,11 +4,29 @@ import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
 # Import the device class from the component that you want to support
-from .const import _LOGGER, API, DOMAIN, IKAMAND_COMPONENTS
+from .const import (
+    _LOGGER,
+    API,
+    CONF_FW_VERSION,
+    CONF_RECORD_SESSIONS,
+    DOMAIN,
+    ENGINE,
+    IKAMAND_COMPONENTS,
+    OPTIONS,
+    RECORDER,
+    RUNTIME_FIELDS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    STORE,
+)
+from .engine import IkamandPollingEngine
 from .ikamand import Ikamand
-from homeassistant.const import CONF_HOST
+from .recorder import open_session_recorder
+from homeassistant.const import CONF_HOST, CONF_MAC
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.storage import Store
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -40,44 +58,101 @@ async def async_setup(hass, base_config):
 async def async_setup_entry(hass, config_entry):
     """Set up iKamand from a config entry."""
 
-    ikamand = Ikamand(config_entry.data[CONF_HOST])
-    hass.data[DOMAIN][config_entry.entry_id] = {API: ikamand}
+    ikamand = Ikamand(config_entry.data[CONF_HOST], async_get_clientsession(hass))
+    hass.data[DOMAIN][config_entry.entry_id] = {API: ikamand, OPTIONS: dict(config_entry.options)}
+
+    if CONF_MAC in config_entry.data:
+        ikamand.restore_info(config_entry.data[CONF_MAC], config_entry.data[CONF_FW_VERSION])
+    else:
+        await ikamand.get_info()
+
+        if not ikamand._online:
+            raise ConfigEntryNotReady
 
-    await ikamand.get_info()
+        async_save_info(hass, config_entry, ikamand)
 
-    if not ikamand._online:
-        raise ConfigEntryNotReady
+    store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
+    hass.data[DOMAIN][config_entry.entry_id][STORE] = store
+    config_entry.async_on_unload(ikamand.add_listener(lambda: store.async_delay_save(lambda: ikamand.runtime_state, STORAGE_SAVE_DELAY), RUNTIME_FIELDS))
 
-    hass.loop.create_task(ikamand.get_data())
+    if state := await store.async_load():
+        ikamand.restore_state(state)
+
+    if config_entry.options.get(CONF_RECORD_SESSIONS):
+        recorder = await hass.async_add_executor_job(open_session_recorder, hass.config.path(DOMAIN), ikamand.mac_address)
+        hass.data[DOMAIN][config_entry.entry_id][RECORDER] = recorder
+        ikamand.set_recorder(recorder)
 
     await hass.config_entries.async_forward_entry_setups(config_entry, IKAMAND_COMPONENTS)
 
+    if ENGINE not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][ENGINE] = IkamandPollingEngine()
+
+    hass.data[DOMAIN][ENGINE].add(config_entry.entry_id, ikamand)
+
+    config_entry.async_on_unload(ikamand.add_listener(lambda: async_save_info(hass, config_entry, ikamand), {"info"}))
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+def async_save_info(hass, config_entry, ikamand):
+    """Cache the device identity in the config entry, so later setups need not reach the device."""
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        data={**config_entry.data, CONF_MAC: ikamand.mac_address, CONF_FW_VERSION: ikamand.firmware_version},
+    )
+
+
+async def async_reload_entry(hass, config_entry):
+    """Reload a config entry when its options change, not when only its cached data does."""
+
+    if config_entry.options != hass.data[DOMAIN][config_entry.entry_id][OPTIONS]:
+        await hass.config_entries.async_reload(config_entry.entry_id)
+
+
 async def async_unload_entry(hass, config_entry) -> bool:
     """Unload a config entry."""
 
     if unload_ok := await hass.config_entries.async_unload_platforms(config_entry, IKAMAND_COMPONENTS):
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        await hass.data[DOMAIN][ENGINE].remove(config_entry.entry_id)
+        data = hass.data[DOMAIN].pop(config_entry.entry_id)
+        await data[API].close()
+        await data[STORE].async_save(data[API].runtime_state)
+
+        if not hass.data[DOMAIN][ENGINE].devices:
+            hass.data[DOMAIN].pop(ENGINE)
+
+        if RECORDER in data:
+            data[API].set_recorder(None)
+            await hass.async_add_executor_job(data[RECORDER].close)
     return unload_ok
 
 
+async def async_remove_entry(hass, config_entry):
+    """Delete the saved runtime state of a removed config entry."""
+
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}").async_remove()
+
+
 class iKamandDevice(Entity):
     """Representation of a iKamand device."""
 
     def __init__(self, ikamand, config_entry):
         """Initialize the iKamand device."""
+        self._fields = None
         self._ikamand = ikamand
-        self._unique_id = "iKamand"
+        self._unique_id = ikamand.mac_address
 
     async def async_added_to_hass(self):
         """Register state update callback."""
+        self.async_on_remove(self._ikamand.add_listener(self.async_write_ha_state, self._fields))
 
     @property
     def should_poll(self) -> bool:
-        """Home Assistant will poll an entity when the should_poll property returns True."""
-        return True
+        """State is pushed by the iKamand client when new data is available."""
+        return False
 
     @property
     def unique_id(self):
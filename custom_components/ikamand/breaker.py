@@ -0,0 +1,37 @@
+"""iKamand circuit breaker."""
+import aiohttp
+
+from .const import BREAKER_THRESHOLD
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised instead of sending a request to a device known to be down."""
+
+
+class CircuitBreaker:
+    """Track consecutive transport failures and open after a threshold, until a probe closes it."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD):
+        """Initialize the breaker, closed."""
+        self._failures = 0
+        self._open = False
+        self._threshold = threshold
+
+    @property
+    def is_open(self):
+        """Return True while requests should fail fast."""
+        return self._open
+
+    def record_failure(self):
+        """Record a request that timed out or could not connect, return True if it opened the breaker."""
+        self._failures += 1
+
+        if not self._open and self._failures >= self._threshold:
+            self._open = True
+            return True
+        return False
+
+    def record_success(self):
+        """Record a request that reached the device, closing the breaker."""
+        self._failures = 0
+        self._open = False
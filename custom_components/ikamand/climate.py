@@ -1,15 +1,57 @@
 """iKamand thermostats."""
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
 from . import iKamandDevice
-from .const import _LOGGER, API, DOMAIN
-from datetime import timedelta
+from .const import (
+    _LOGGER,
+    API,
+    ATTR_END_TIME,
+    ATTR_FOOD_PROBE,
+    ATTR_PROBE_TARGETS,
+    ATTR_STEPS,
+    DOMAIN,
+    PIT_TEMP_MAX,
+    PIT_TEMP_MAX_F,
+    PIT_TEMP_MIN,
+    PIT_TEMP_MIN_F,
+    PROBE_TEMP_MAX,
+    PROBE_TEMP_MAX_F,
+    SERVICE_CONFIGURE_COOK,
+    SERVICE_START_PROGRAM,
+    SERVICE_STOP_PROGRAM,
+)
+from .program import STEP_FIELDS, STEP_RAMP, STEP_SET_PIT, STEP_START_COOKING, STEP_STOP
 from homeassistant.components.climate import ClimateEntity, ClimateEntityFeature, HVACMode
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_platform
+from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_conversion import TemperatureConverter
 
-SCAN_INTERVAL = timedelta(seconds=5)
-
 SUPPORT_HVAC = [HVACMode.HEAT, HVACMode.OFF]
 
+CONFIGURE_COOK_SCHEMA = {
+    vol.Required(ATTR_TEMPERATURE): vol.Coerce(int),
+    vol.Optional(ATTR_FOOD_PROBE, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+    vol.Optional(ATTR_END_TIME): cv.datetime,
+    **{vol.Optional(attr): vol.Coerce(int) for attr in ATTR_PROBE_TARGETS},
+}
+
+PROGRAM_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required("type"): vol.In(STEP_FIELDS),
+        vol.Optional("temperature"): vol.Coerce(int),
+        vol.Optional("duration"): cv.positive_time_period,
+        vol.Optional("time"): cv.datetime,
+        vol.Optional("probe"): vol.All(vol.Coerce(int), vol.Range(min=1, max=3)),
+    }
+)
+
+START_PROGRAM_SCHEMA = {
+    vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [PROGRAM_STEP_SCHEMA], vol.Length(min=1)),
+}
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the iKamand thermostats."""
@@ -21,14 +63,21 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     async_add_entities(entities, True)
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(SERVICE_CONFIGURE_COOK, CONFIGURE_COOK_SCHEMA, "async_configure_cook")
+    platform.async_register_entity_service(SERVICE_START_PROGRAM, START_PROGRAM_SCHEMA, "async_start_program")
+    platform.async_register_entity_service(SERVICE_STOP_PROGRAM, {}, "async_stop_program")
+
 
 class IkamandThermostat(iKamandDevice, ClimateEntity):
     """Represents a iKamand thermostat."""
     _enable_turn_on_off_backwards_compatibility = False
+    _unrecorded_attributes = frozenset({"Mean Error", "Error Std Dev", "Overshoot", "Time In Band", "Fan Duty Average"})
 
     def __init__(self, ikamand, config_entry):
         """Initialize the device."""
         super().__init__(ikamand, config_entry)
+        self._fields = {"cooking", "online", "pit_stats", "pit_temp", "program", "target_pit_temp"}
         self._ikamand = ikamand
 
     @property
@@ -36,6 +85,31 @@ class IkamandThermostat(iKamandDevice, ClimateEntity):
         """Return the icon for this sensor."""
         return "mdi:grill"
 
+    @property
+    def extra_state_attributes(self):
+        """Return the cook program step and the pit-control statistics of the current cook."""
+        attrs = {}
+        program = self._ikamand.program
+        if program is not None:
+            attrs["Program Step"] = f"{program.index + 1}/{len(program.steps)} {program.step['type']}"
+        stats = self._ikamand.pit_stats
+        if not stats.count:
+            return attrs or None
+        attrs["Mean Error"] = self._convert_delta(stats.mean_error)
+        attrs["Error Std Dev"] = self._convert_delta(stats.std_dev)
+        attrs["Overshoot"] = self._convert_delta(stats.overshoot)
+        attrs["Time In Band"] = None if stats.time_in_band is None else round(stats.time_in_band, 1)
+        attrs["Fan Duty Average"] = round(stats.fan_duty_average, 1)
+        return attrs
+
+    def _convert_delta(self, delta):
+        """Convert a temperature difference from °C to the unit of this thermostat."""
+        if delta is None:
+            return None
+        if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
+            return round(delta * 1.8, 1)
+        return round(delta, 1)
+
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -91,6 +165,7 @@ class IkamandThermostat(iKamandDevice, ClimateEntity):
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set the operation mode."""
+        self._ikamand.stop_program()
         if hvac_mode == HVACMode.HEAT:
             await self._ikamand.start_ikamand(self.target_temperature)
         elif hvac_mode == HVACMode.OFF:
@@ -103,23 +178,119 @@ class IkamandThermostat(iKamandDevice, ClimateEntity):
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
             temperature = round(TemperatureConverter.convert(temperature, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS))
+        self._ikamand.stop_program()
         await self._ikamand.start_ikamand(temperature)
 
+    async def async_configure_cook(self, temperature, food_probe=0, end_time=None, **probe_targets):
+        """Start a whole cook in one command: pit target, probe targets, food probe and end time."""
+        fahrenheit = self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+        probe_max = PROBE_TEMP_MAX_F if fahrenheit else PROBE_TEMP_MAX
+
+        if not self.min_temp <= temperature <= self.max_temp:
+            raise ServiceValidationError(f"Pit temperature must be between {self.min_temp} and {self.max_temp}")
+
+        for attr, target in probe_targets.items():
+            if not 0 <= target <= probe_max:
+                raise ServiceValidationError(f"{attr} must be between 0 and {probe_max}")
+
+        targets = {probe: probe_targets[attr] for probe, attr in enumerate(ATTR_PROBE_TARGETS, 1) if attr in probe_targets}
+
+        if food_probe and not targets.get(food_probe, getattr(self._ikamand, f"probe_{food_probe}_target_temperature")):
+            raise ServiceValidationError(f"Food probe {food_probe} needs a target temperature")
+
+        if end_time is not None:
+            end_time = self._to_timestamp(end_time)
+
+        if end_time is not None and end_time <= dt_util.utcnow().timestamp():
+            raise ServiceValidationError("End time must be in the future")
+
+        if fahrenheit:
+            temperature = self._to_celsius(temperature)
+            targets = {probe: self._to_celsius(target) for probe, target in targets.items()}
+
+        self._ikamand.stop_program()
+        await self._ikamand.configure_cook(
+            temperature,
+            food_probe=food_probe,
+            probe_targets=targets,
+            end_time=end_time,
+        )
+
+    async def async_start_program(self, steps):
+        """Run a cook program of timed or probe-triggered steps on the client, replacing manual control."""
+        program = []
+        cooking = self._ikamand.cooking
+
+        for number, step in enumerate(steps, 1):
+            kind = step["type"]
+            missing = [field for field in STEP_FIELDS[kind] if field not in step]
+
+            if missing:
+                raise ServiceValidationError(f"Step {number} ({kind}) needs {', '.join(missing)}")
+
+            if kind in (STEP_RAMP, STEP_SET_PIT):
+                cooking = True
+            elif kind == STEP_STOP:
+                cooking = False
+            elif kind == STEP_START_COOKING and not cooking:
+                raise ServiceValidationError(f"Step {number} ({kind}) needs a running cook, start one with a set_pit or ramp step before it")
+
+            program_step = {"type": kind}
+
+            if "temperature" in STEP_FIELDS[kind]:
+                program_step["temperature"] = self._program_temperature(number, step["temperature"], kind in (STEP_RAMP, STEP_SET_PIT))
+            if "duration" in STEP_FIELDS[kind]:
+                program_step["duration"] = step["duration"].total_seconds()
+            if "time" in STEP_FIELDS[kind]:
+                program_step["time"] = self._to_timestamp(step["time"])
+            if "probe" in STEP_FIELDS[kind]:
+                program_step["probe"] = step["probe"]
+
+            program.append(program_step)
+
+        self._ikamand.start_program(program)
+
+    async def async_stop_program(self):
+        """Stop the cook program, leaving the cook as it is."""
+        self._ikamand.stop_program()
+
+    def _program_temperature(self, number, temperature, pit):
+        """Check a program step temperature against the device limits and return it in °C."""
+        fahrenheit = self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+
+        if pit:
+            low, high = self.min_temp, self.max_temp
+        else:
+            low, high = 0, PROBE_TEMP_MAX_F if fahrenheit else PROBE_TEMP_MAX
+
+        if not low <= temperature <= high:
+            raise ServiceValidationError(f"Step {number} temperature must be between {low} and {high}")
+
+        return self._to_celsius(temperature) if fahrenheit else temperature
+
+    def _to_celsius(self, temperature):
+        """Convert a temperature from °F to °C."""
+        return round(TemperatureConverter.convert(temperature, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS))
+
+    def _to_timestamp(self, value):
+        """Convert a service datetime to a Unix timestamp, reading a naive one in the Home Assistant time zone."""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        return value.timestamp()
+
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        """The iKamand can control between 150°F-500°F (66°C-260°C)"""
         if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
-            return 150
-        return 66
+            return PIT_TEMP_MIN_F
+        return PIT_TEMP_MIN
 
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        """The iKamand can control between 150°F-500°F (66°C-260°C)"""
         if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
-            return 500
-        return 260
+            return PIT_TEMP_MAX_F
+        return PIT_TEMP_MAX
 
     @property
     def available(self) -> bool:
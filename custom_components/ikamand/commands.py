@@ -0,0 +1,114 @@
+"""iKamand command queue."""
+import asyncio
+
+from .const import COMMAND_DEBOUNCE, COOK_START, FOOD_PROBE, TARGET_FOOD_TEMP, TARGET_PIT_TEMP
+
+
+def merge_key(payload):
+    """Return what identifies the state a payload sets, so a later one can replace it."""
+    return frozenset(payload), payload.get(FOOD_PROBE)
+
+
+def expected_state(payload):
+    """Return the snapshot fields, and their values, a payload should lead to."""
+    expected = {}
+
+    if COOK_START in payload:
+        expected["cooking"] = bool(int(payload[COOK_START]))
+
+        if expected["cooking"] and TARGET_PIT_TEMP in payload:
+            expected["target_pit_temp"] = int(payload[TARGET_PIT_TEMP])
+
+    if int(payload.get(FOOD_PROBE) or 0):
+        expected["food_probe"] = int(payload[FOOD_PROBE])
+        expected["target_food_temp"] = int(payload[TARGET_FOOD_TEMP])
+
+    return expected
+
+
+class PendingCommand:
+    """A command sent to a device and waiting to be seen in its data."""
+
+    __slots__ = ("attempts", "expected", "future", "payload")
+
+    def __init__(self, payload, expected, future):
+        """Initialize the pending command."""
+        self.attempts = 0
+        self.expected = expected
+        self.future = future
+        self.payload = payload
+
+    def check(self, data):
+        """Resolve the command if a snapshot shows its expected state."""
+        if not self.future.done() and all(getattr(data, field) == value for field, value in self.expected.items()):
+            self.future.set_result(True)
+
+
+class CommandQueue:
+    """Send the commands of one device one at a time, merging those that pile up behind a request.
+
+    A command submitted while the queue is idle is sent at once. The ones
+    submitted while a request is in flight wait for it, then for the window
+    to let the burst settle, and are merged when they set the same state.
+    """
+
+    def __init__(self, send, window=COMMAND_DEBOUNCE):
+        """Initialize the queue with the coroutine function that sends one payload."""
+        self._in_flight = None
+        self._pending = []
+        self._send = send
+        self._task = None
+        self._window = window
+
+    async def submit(self, payload):
+        """Queue a payload and return the result of the request that carried it."""
+        loop = asyncio.get_running_loop()
+        key = merge_key(payload)
+
+        for pending in self._pending:
+            if pending[0] == key:
+                pending[1] = payload
+                future = pending[2]
+                break
+        else:
+            future = loop.create_future()
+            self._pending.append([key, payload, future])
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+        return await asyncio.shield(future)
+
+    def cancel(self):
+        """Drop the pending commands and the one in flight, and stop sending."""
+        if self._task is not None:
+            self._task.cancel()
+
+        if self._in_flight is not None:
+            self._in_flight.cancel()
+            self._in_flight = None
+
+        for _, _, future in self._pending:
+            future.cancel()
+
+        self._pending.clear()
+
+    async def _run(self):
+        """Send the pending payloads in order, waiting the window before a request when others piled up behind the last one."""
+        while self._pending:
+            _, payload, future = self._pending.pop(0)
+            self._in_flight = future
+
+            try:
+                result = await self._send(payload)
+            except Exception as err:
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._in_flight = None
+
+            if self._pending:
+                await asyncio.sleep(self._window)
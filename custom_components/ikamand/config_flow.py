@@ -2,17 +2,21 @@
 import voluptuous as vol
 
 # Import the device class from the component that you want to support
-from .const import _LOGGER, DOMAIN
+from .const import _LOGGER, CONF_FW_VERSION, CONF_RECORD_SESSIONS, DOMAIN
+from .discovery import async_discover, subnet_hosts
 from .ikamand import Ikamand
 from homeassistant import config_entries, exceptions
-from homeassistant.const import CONF_HOST
+from homeassistant.components import network
+from homeassistant.const import CONF_HOST, CONF_MAC
 from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
     }
 )
+MANUAL = "manual"
 
 
 @callback
@@ -28,17 +32,31 @@ class iKamandConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
+    def __init__(self):
+        """Initialize the config flow."""
+        self._discovered = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return iKamandOptionsFlow(config_entry)
+
     async def async_step_import(self, import_config):
         """Import a config entry from configuration.yaml."""
         return await self.async_step_user(import_config)
 
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Handle the initial step, offering the iKamand found on the local network first."""
         errors = {}
+        if user_input is None and self._discovered is None:
+            self._discovered = await async_discover_local(self.hass)
+            if self._discovered:
+                return await self.async_step_pick()
         if user_input:
             try:
-                await validate_input(self.hass, user_input)
-                return self.async_create_entry(title="", data=user_input)
+                info = await validate_input(self.hass, user_input)
+                return self.async_create_entry(title="", data={**user_input, **info})
             except AlreadyConfigured:
                 return self.async_abort(reason="already_configured")
             except CannotConnect:
@@ -48,21 +66,76 @@ class iKamandConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA, errors=errors)
 
+    async def async_step_pick(self, user_input=None):
+        """Let the user pick a discovered iKamand or enter an address."""
+        if user_input is not None:
+            if user_input[CONF_HOST] == MANUAL:
+                return await self.async_step_user()
+
+            mac_address, firmware_version = self._discovered[user_input[CONF_HOST]]
+            return self.async_create_entry(
+                title="",
+                data={CONF_HOST: user_input[CONF_HOST], CONF_MAC: mac_address, CONF_FW_VERSION: firmware_version},
+            )
+
+        choices = {host: f"iKamand-{mac_address[-4:]} ({host})" for host, (mac_address, _) in self._discovered.items()}
+        choices[MANUAL] = "Enter an address manually"
+        return self.async_show_form(step_id="pick", data_schema=vol.Schema({vol.Required(CONF_HOST): vol.In(choices)}))
+
+
+class iKamandOptionsFlow(config_entries.OptionsFlow):
+    """Handle the iKamand options."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options_schema = vol.Schema(
+            {
+                vol.Optional(CONF_RECORD_SESSIONS, default=self._config_entry.options.get(CONF_RECORD_SESSIONS, False)): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=options_schema)
+
+
+async def async_discover_local(hass):
+    """Scan the networks of the enabled adapters for iKamand not configured yet."""
+
+    configured_hosts = {entry.data[CONF_HOST] for entry in hass.config_entries.async_entries(DOMAIN)}
+    configured_macs = {entry.data.get(CONF_MAC) for entry in hass.config_entries.async_entries(DOMAIN)}
+    hosts = []
+
+    for adapter in await network.async_get_adapters(hass):
+        if adapter["enabled"]:
+            for ipv4 in adapter["ipv4"]:
+                hosts.extend(host for host in subnet_hosts(ipv4["address"], ipv4["network_prefix"]) if host not in configured_hosts)
+
+    discovered = await async_discover(async_get_clientsession(hass), list(dict.fromkeys(hosts)))
+    _LOGGER.debug("Discovered %s iKamand among %s hosts", len(discovered), len(hosts))
+    return {host: info for host, info in discovered.items() if info[0] not in configured_macs}
+
 
 async def validate_input(hass, data):
-    """Validate the user input allows us to connect."""
+    """Validate the user input allows us to connect, return the device identity to cache."""
 
     for entry in hass.config_entries.async_entries(DOMAIN):
         if entry.data[CONF_HOST] == data[CONF_HOST]:
             raise AlreadyConfigured
 
-    ikamand = Ikamand(data[CONF_HOST])
+    ikamand = Ikamand(data[CONF_HOST], async_get_clientsession(hass))
 
     await ikamand.get_info()
 
     if not ikamand._online:
         raise CannotConnect
 
+    return {CONF_MAC: ikamand.mac_address, CONF_FW_VERSION: ikamand.firmware_version}
+
 
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
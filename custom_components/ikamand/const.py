@@ -3,7 +3,13 @@ import logging
 
 _LOGGER = logging.getLogger(__name__)
 API = "api"
+CONF_FW_VERSION = "fw_version"
+CONF_RECORD_SESSIONS = "record_sessions"
 DOMAIN = "ikamand"
+ENGINE = "engine"
+OPTIONS = "options"
+RECORDER = "recorder"
+STORE = "store"
 IKAMAND_COMPONENTS = [
     "climate",
     "number",
@@ -13,6 +19,15 @@ IKAMAND_COMPONENTS = [
 GOOD_HTTP_CODES = [200, 201, 202, 203]
 FALSE_TEMPS = ["-400", "400"]
 
+# Services
+ATTR_END_TIME = "end_time"
+ATTR_FOOD_PROBE = "food_probe"
+ATTR_PROBE_TARGETS = ("probe_1_target_temperature", "probe_2_target_temperature", "probe_3_target_temperature")
+ATTR_STEPS = "steps"
+SERVICE_CONFIGURE_COOK = "configure_cook"
+SERVICE_START_PROGRAM = "start_program"
+SERVICE_STOP_PROGRAM = "stop_program"
+
 # cgi-bin/data
 COOK_END_TIME = "sce"
 COOK_ID = "csid"
@@ -36,3 +51,63 @@ UPTIME = "time"
 ENV = "env"
 FW_VERSION = "fw_version"
 MAC_ADDRESS = "MAC"
+
+# Device limits: the iKamand can control between 150°F-500°F (66°C-260°C)
+FAN_DURATION_MAX = 30
+PIT_TEMP_MAX = 260
+PIT_TEMP_MAX_F = 500
+PIT_TEMP_MIN = 66
+PIT_TEMP_MIN_F = 150
+PROBE_TEMP_MAX = 260
+PROBE_TEMP_MAX_F = 500
+
+# Polling intervals (seconds)
+POLL_INTERVAL_BACKOFF_MAX = 120
+POLL_INTERVAL_FAST = 2
+POLL_INTERVAL_IDLE = 30
+POLL_INTERVAL_NORMAL = 5
+POLL_NEAR_TARGET = 10
+MAX_PARALLEL_POLLS = 8
+POLL_STAGGER = 0.5
+
+# Requests (seconds)
+REQUEST_CONNECT_TIMEOUT = 1
+REQUEST_READ_TIMEOUT = 1.5
+REQUEST_TOTAL_TIMEOUT = 3
+BREAKER_PROBE_INTERVAL = 5
+BREAKER_THRESHOLD = 2
+
+# Discovery (seconds)
+DISCOVERY_CONCURRENCY = 128
+DISCOVERY_CONNECT_TIMEOUT = 1
+DISCOVERY_MAX_PREFIX = 24
+DISCOVERY_TIMEOUT = 1.5
+
+# Commands (seconds)
+COMMAND_DEBOUNCE = 0.3
+COMMAND_CONFIRM_TIMEOUTS = (2, 3, 5)
+
+# Runtime state storage
+RUNTIME_FIELDS = frozenset(("probe_1_target_temperature", "probe_2_target_temperature", "probe_3_target_temperature", "program", "set_fan_duration", "starting", "starting_end_time"))
+STORAGE_SAVE_DELAY = 10
+STORAGE_VERSION = 1
+
+# Session recorder (seconds)
+RECORDER_FSYNC_INTERVAL = 60
+
+# Telemetry history
+HISTORY_SIZE = 8640
+
+# Probe done-time estimation
+ETA_LONG_WINDOW = 7200
+ETA_MIN_SAMPLES = 10
+ETA_SHORT_WINDOW = 1200
+ETA_STALL_SLOPE = 1 / 3600
+
+# Pit statistics
+PIT_BAND = 5
+PIT_MAX_GAP = 60
+
+# Metrics histogram bucket bounds (seconds)
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_PARSE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001)
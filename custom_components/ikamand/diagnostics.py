@@ -0,0 +1,33 @@
+"""Diagnostics support for iKamand."""
+from .const import API, DOMAIN
+from .snapshot import IkamandSnapshot
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_MAC
+
+TO_REDACT = {CONF_HOST, CONF_MAC, "mac_address"}
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+    """Return the runtime state and metrics of a config entry."""
+
+    ikamand = hass.data[DOMAIN][config_entry.entry_id][API]
+
+    return async_redact_data(
+        {
+            "entry": {
+                "data": dict(config_entry.data),
+                "options": dict(config_entry.options),
+            },
+            "device": {
+                "firmware_version": ikamand.firmware_version,
+                "mac_address": ikamand.mac_address,
+                "online": ikamand.online,
+                "starting": ikamand.starting,
+                "poll_interval": ikamand.poll_interval,
+                "last_command": ikamand.last_command,
+            },
+            "data": {field: getattr(ikamand.data, field) for field in IkamandSnapshot.__slots__},
+            "metrics": ikamand.metrics.as_dict(),
+        },
+        TO_REDACT,
+    )
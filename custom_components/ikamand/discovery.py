@@ -0,0 +1,52 @@
+"""iKamand LAN discovery."""
+import aiohttp
+import asyncio
+import ipaddress
+
+from .const import (
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_MAX_PREFIX,
+    DISCOVERY_TIMEOUT,
+    FW_VERSION,
+    GOOD_HTTP_CODES,
+    MAC_ADDRESS,
+)
+from urllib.parse import parse_qs
+
+
+def subnet_hosts(address, prefix):
+    """Return the other host addresses of an interface network, narrowed to the DISCOVERY_MAX_PREFIX around the address."""
+    interface = ipaddress.ip_interface(f"{address}/{max(prefix, DISCOVERY_MAX_PREFIX)}")
+
+    if not interface.ip.is_private:
+        return []
+    return [str(host) for host in interface.network.hosts() if host != interface.ip]
+
+
+async def probe(session, host, timeout):
+    """Return the MAC address and firmware version of the iKamand at host, or None if it is not one."""
+    try:
+        async with session.get(f"http://{host}/cgi-bin/info", timeout=timeout) as response:
+            if response.status not in GOOD_HTTP_CODES:
+                return None
+            info = parse_qs(await response.text())
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError):
+        return None
+
+    if MAC_ADDRESS in info and FW_VERSION in info:
+        return info[MAC_ADDRESS][0], info[FW_VERSION][0]
+    return None
+
+
+async def async_discover(session, hosts, concurrency=DISCOVERY_CONCURRENCY, timeout=DISCOVERY_TIMEOUT):
+    """Probe hosts concurrently, return {host: (mac_address, firmware_version)} for every iKamand found."""
+    semaphore = asyncio.Semaphore(concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=min(timeout, DISCOVERY_CONNECT_TIMEOUT))
+
+    async def bounded_probe(host):
+        async with semaphore:
+            return host, await probe(session, host, client_timeout)
+
+    results = await asyncio.gather(*(bounded_probe(host) for host in hosts))
+    return {host: info for host, info in results if info is not None}
@@ -0,0 +1,54 @@
+"""iKamand polling engine."""
+import asyncio
+
+from .const import _LOGGER, MAX_PARALLEL_POLLS, POLL_INTERVAL_NORMAL, POLL_STAGGER
+
+
+class IkamandPollingEngine:
+    """Poll every configured iKamand concurrently, with bounded parallelism."""
+
+    def __init__(self, max_parallel=MAX_PARALLEL_POLLS, stagger=POLL_STAGGER):
+        """Initialize the engine."""
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._slot = 0
+        self._stagger = stagger
+        self._tasks = {}
+
+    @property
+    def devices(self):
+        """Return the keys of the devices being polled."""
+        return list(self._tasks)
+
+    def add(self, key, ikamand):
+        """Start polling a device under the given key, replacing any poller left under it."""
+        if key in self._tasks:
+            _LOGGER.warning("Replacing the poller of %s, which was not removed", ikamand.base_url)
+            self._tasks.pop(key).cancel()
+
+        offset = (self._slot * self._stagger) % POLL_INTERVAL_NORMAL
+        self._slot += 1
+        self._tasks[key] = asyncio.get_running_loop().create_task(self._poll_loop(ikamand, offset))
+
+    async def remove(self, key):
+        """Stop polling the device registered under the given key and wait for its poller to end."""
+        task = self._tasks.pop(key, None)
+
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _poll_loop(self, ikamand, offset):
+        """Poll a device forever, starting after its stagger offset."""
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(offset)
+
+        while True:
+            try:
+                queued = loop.time()
+                async with self._semaphore:
+                    ikamand.metrics.queue_wait.add(loop.time() - queued)
+                    await ikamand.async_update()
+            except Exception:
+                _LOGGER.exception("Unexpected error while polling %s", ikamand.base_url)
+
+            await ikamand.wait_next_poll()
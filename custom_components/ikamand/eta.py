@@ -0,0 +1,111 @@
+"""iKamand probe done-time estimation."""
+import math
+
+from .const import ETA_LONG_WINDOW, ETA_MIN_SAMPLES, ETA_SHORT_WINDOW, ETA_STALL_SLOPE
+
+
+class WindowFit:
+    """A least-squares line through one history field over a sliding time window, updated in O(1) per sample."""
+
+    def __init__(self, history, field, window):
+        """Initialize the fit."""
+        self._field = field
+        self._history = history
+        self._window = window
+        self._reset(history.total)
+
+    def _reset(self, index):
+        """Empty the window, starting it at an absolute sample index."""
+        self._start = self._end = index
+        self._n = 0
+        self._t0 = None
+        self._st = self._stt = self._sy = self._sty = 0.0
+
+    def _add(self, index, sign):
+        """Add (sign 1) or remove (sign -1) a sample from the running sums."""
+        y = self._history.value(self._field, index)
+
+        if math.isnan(y):
+            return
+
+        timestamp = self._history.value("timestamp", index)
+
+        if self._t0 is None:
+            self._t0 = timestamp
+
+        t = timestamp - self._t0
+        self._n += sign
+        self._st += sign * t
+        self._stt += sign * t * t
+        self._sy += sign * y
+        self._sty += sign * t * y
+
+    def update(self):
+        """Add the samples appended since the last update and drop those older than the window."""
+        history = self._history
+
+        if self._start < history.total - len(history):
+            self._reset(history.total - len(history))
+
+        while self._end < history.total:
+            self._add(self._end, 1)
+            self._end += 1
+
+        if self._end == self._start:
+            return
+
+        oldest = history.value("timestamp", self._end - 1) - self._window
+
+        while self._start < self._end and history.value("timestamp", self._start) < oldest:
+            self._add(self._start, -1)
+            self._start += 1
+
+        if not self._n:
+            self._t0 = None
+            self._st = self._stt = self._sy = self._sty = 0.0
+
+    @property
+    def slope(self):
+        """Return the fitted slope per second, None without enough samples."""
+        if self._n < ETA_MIN_SAMPLES:
+            return None
+
+        denominator = self._n * self._stt - self._st * self._st
+
+        if denominator <= 0:
+            return None
+        return (self._n * self._sty - self._st * self._sy) / denominator
+
+
+class ProbeEtaEstimator:
+    """Estimate when a probe reaches its target from its recent temperature curve."""
+
+    def __init__(self, history, probe):
+        """Initialize the estimator."""
+        field = f"probe_{probe}"
+        self._long = WindowFit(history, field, ETA_LONG_WINDOW)
+        self._short = WindowFit(history, field, ETA_SHORT_WINDOW)
+
+    def update(self):
+        """Fold in the samples appended to the history since the last update."""
+        self._long.update()
+        self._short.update()
+
+    def eta(self, current, target, now):
+        """Return the timestamp at which the probe should reach target, None if unknown.
+
+        The recent trend is used while the temperature climbs. During a stall,
+        when the recent trend is flat, the longer average rate that includes
+        the climb before the plateau is used instead.
+        """
+        if current is None or not target:
+            return None
+
+        if current >= target:
+            return now
+
+        for slope in (self._short.slope, self._long.slope):
+            if slope is not None and slope >= ETA_STALL_SLOPE:
+                return now + (target - current) / slope
+
+        return None
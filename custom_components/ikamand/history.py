@@ -0,0 +1,65 @@
+"""iKamand telemetry history."""
+from array import array
+
+from .const import HISTORY_SIZE
+
+FIELDS = ("timestamp", "pit_temp", "probe_1", "probe_2", "probe_3", "fan_speed", "target_pit_temp")
+NAN = float("nan")
+
+
+class TelemetryHistory:
+    """A fixed-capacity ring buffer of recent samples, stored as one array per field."""
+
+    def __init__(self, capacity=HISTORY_SIZE):
+        """Initialize the history, allocating all of its memory up front."""
+        self._capacity = capacity
+        self._columns = {field: array("d" if field == "timestamp" else "f", bytes(8 * capacity if field == "timestamp" else 4 * capacity)) for field in FIELDS}
+        self._total = 0
+
+    def __len__(self):
+        """Return the number of samples held."""
+        return min(self._total, self._capacity)
+
+    @property
+    def capacity(self):
+        """Return the maximum number of samples held."""
+        return self._capacity
+
+    @property
+    def total(self):
+        """Return the number of samples appended since creation, used as absolute sample indexes."""
+        return self._total
+
+    def append(self, timestamp, data):
+        """Append a sample from a snapshot, overwriting the oldest one when full; unknown values are stored as NaN."""
+        index = self._total % self._capacity
+        columns = self._columns
+        columns["timestamp"][index] = timestamp
+
+        for field in FIELDS[1:]:
+            value = getattr(data, field)
+            columns[field][index] = NAN if value is None else value
+
+        self._total += 1
+
+    def value(self, field, index):
+        """Return the value of a field at an absolute sample index still held."""
+        if not self._total - len(self) <= index < self._total:
+            raise IndexError("sample no longer in history")
+        return self._columns[field][index % self._capacity]
+
+    def window(self, field, size=None):
+        """Return the last size values of a field, oldest first, as one or two memoryviews without copying."""
+        size = len(self) if size is None else min(size, len(self))
+        view = memoryview(self._columns[field])
+        end = self._total % self._capacity if self._total >= self._capacity else self._total
+        start = end - size
+
+        if start >= 0:
+            return (view[start:end],)
+        return (view[start + self._capacity:], view[:end])
+
+    def values(self, field, size=None):
+        """Iterate over the last size values of a field, oldest first."""
+        for chunk in self.window(field, size):
+            yield from chunk
@@ -1,134 +1,565 @@
 """iKamand integration."""
 
+import aiohttp
 import asyncio
-import logging
-import requests
 import time
 
 from .const import (
     _LOGGER,
+    BREAKER_PROBE_INTERVAL,
     COOK_END_TIME,
     COOK_ID,
+    COMMAND_CONFIRM_TIMEOUTS,
     COOK_START,
     CURRENT_TIME,
-    FALSE_TEMPS,
-    FAN_SPEED,
     FOOD_PROBE,
     FW_VERSION,
     GOOD_HTTP_CODES,
     MAC_ADDRESS,
-    PIT_TEMP,
-    PROBE_1,
-    PROBE_2,
-    PROBE_3,
+    POLL_INTERVAL_NORMAL,
+    REQUEST_CONNECT_TIMEOUT,
+    REQUEST_READ_TIMEOUT,
+    REQUEST_TOTAL_TIMEOUT,
     TARGET_FOOD_TEMP,
     TARGET_PIT_TEMP,
     UNKNOWN_SEND_VAR1,
 )
+from .breaker import CircuitBreaker, CircuitOpenError
+from .commands import CommandQueue, PendingCommand, expected_state
+from .eta import ProbeEtaEstimator
+from .history import TelemetryHistory
+from .metrics import IkamandMetrics
+from .program import CookProgram
+from .scheduler import PollScheduler
+from .snapshot import EMPTY_SNAPSHOT, parse_snapshot
+from .stats import PitStatistics
 from urllib.parse import parse_qs
 
-urllib3_logger = logging.getLogger('urllib3')
-urllib3_logger.setLevel(logging.CRITICAL)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=REQUEST_TOTAL_TIMEOUT, sock_connect=REQUEST_CONNECT_TIMEOUT, sock_read=REQUEST_READ_TIMEOUT)
 
 
 class Ikamand:
     """A class for the iKamand API."""
 
-    def __init__(self, host_ip):
-        """Initialize the class."""
+    def __init__(self, host_ip, session=None, clock=time.time):
+        """Initialize the class, clock returning the current time as a Unix timestamp."""
         self.base_url = f"http://{host_ip}/cgi-bin/"
-        self._data = {}
-        self._data_bck = {'time': ['0'], 'acs': ['0']}
+        self._clock = clock
+        self._session = session
+        self._owns_session = session is None
+        self._breaker = CircuitBreaker()
+        self._probe_task = None
+        self._data = EMPTY_SNAPSHOT
+        self._data_bck = EMPTY_SNAPSHOT
+        self._device_data = EMPTY_SNAPSHOT
+        self._history = TelemetryHistory()
+        self._eta_estimators = {probe: ProbeEtaEstimator(self._history, probe) for probe in (1, 2, 3)}
         self._info = {}
+        self._info_fetched = False
+        self._changed = set()
+        self._commands = CommandQueue(self._post_commands)
+        self._confirmations = {}
+        self._last_command = None
+        self._listeners = []
+        self._metrics = IkamandMetrics()
         self._online = False
+        self._optimistic = []
+        self._pit_stats = PitStatistics()
+        self._poll_interval = POLL_INTERVAL_NORMAL
+        self._refresh = asyncio.Event()
+        self._probe_eta = {1: None, 2: None, 3: None}
+        self._program = None
+        self._program_tasks = set()
+        self._recorder = None
         self._probe_1_target_temperature = 0
         self._probe_2_target_temperature = 0
         self._probe_3_target_temperature = 0
         self._set_fan_duration = 5
         self._starting = False
+        self._scheduler = PollScheduler()
         self._starting_end_time = 0
+        self._starting_task = None
+        self._starting_timer = None
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             "User-Agent": "ikamand",
         }
 
-    async def get_info(self):
-        """Get iKamand info."""
-        url = f"{self.base_url}info"
+    def _get_session(self):
+        """Return the HTTP session, creating a keep-alive one if none was provided."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1))
+            self._owns_session = True
+        return self._session
 
-        loop = asyncio.get_running_loop()
+    async def _request(self, method, endpoint, headers=None, data=None):
+        """Send a request through the circuit breaker and return the response body, or None on a bad status."""
+        if self._breaker.is_open:
+            self._metrics.short_circuited += 1
+            raise CircuitOpenError(f"iKamand at {self.base_url} is down")
 
         try:
-            response = await loop.run_in_executor(None, lambda: requests.get(url, timeout=10))
+            text = await self._send_request(method, endpoint, headers, data)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if self._breaker.record_failure():
+                _LOGGER.info("iKamand at %s is down, failing requests fast until it answers again", self.base_url)
+                self._probe_task = asyncio.get_running_loop().create_task(self._probe_until_up())
+            raise
+
+        self._breaker.record_success()
+        return text
+
+    async def _probe_until_up(self):
+        """Probe the device in the background until it answers, then close the breaker and poll."""
+        while True:
+            await asyncio.sleep(BREAKER_PROBE_INTERVAL)
+
+            try:
+                await self._send_request("GET", "info")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                continue
+
+            self._breaker.record_success()
+            self._probe_task = None
+            self.request_refresh()
+            return
+
+    async def _send_request(self, method, endpoint, headers=None, data=None):
+        """Send a request to iKamand and return the response body, or None on a bad status."""
+        session = self._get_session()
+
+        async with session.request(method, f"{self.base_url}{endpoint}", headers=headers, data=data, timeout=REQUEST_TIMEOUT) as response:
+            if response.status in GOOD_HTTP_CODES:
+                return await response.text()
+            return None
+
+    async def close(self):
+        """Drop pending commands and close the HTTP session if it is owned by this instance."""
+        self._commands.cancel()
+
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+        self._cancel_starting_timer()
+
+        for task in list(self._program_tasks):
+            task.cancel()
+
+        if self._starting_task is not None:
+            self._starting_task.cancel()
+            self._starting_task = None
+
+        for task in list(self._confirmations):
+            task.cancel()
+
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    def add_listener(self, update_callback, fields=None):
+        """Register a callback called when any of fields changes (any field if None), return a function to remove it."""
+        listener = (update_callback, None if fields is None else frozenset(fields))
+        self._listeners.append(listener)
+
+        def remove_listener():
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _notify_listeners(self):
+        """Push the fields changed since the last call to the callbacks watching them."""
+        changed, self._changed = self._changed, set()
+
+        if not changed:
+            return
+
+        for update_callback, fields in list(self._listeners):
+            if fields is None or not fields.isdisjoint(changed):
+                update_callback()
+
+    def _update_data(self, data):
+        """Store a new device snapshot, shown with the state of unconfirmed commands, and record which fields changed."""
+        self._device_data = data
+
+        for expected in self._optimistic:
+            data = data.replace(**expected)
+
+        self._changed.update(data.changed_fields(self._data))
+        self._data = data
+
+    def _show_optimistic(self, expected):
+        """Show the state a command leads to until the device confirms or contradicts it."""
+        if expected:
+            self._optimistic.append(expected)
+            self._update_data(self._device_data)
+
+    def _drop_optimistic(self, expected):
+        """Stop showing the state of a command, rolling back to what the device reports."""
+        if expected in self._optimistic:
+            self._optimistic.remove(expected)
+            self._update_data(self._device_data)
+
+    def _update_last_command(self, status, attempts, latency):
+        """Store the outcome of the last tracked command."""
+        self._last_command = {"status": status, "attempts": attempts, "latency": latency}
+        self._changed.add("last_command")
+
+    def _update_online(self, online):
+        """Store the reachability and record whether it changed."""
+        if online != self._online:
+            self._changed.add("online")
+            self._metrics.record_transition(online, self._clock())
+            if online:
+                _LOGGER.info("iKamand at %s is online", self.base_url)
+            else:
+                _LOGGER.info("iKamand at %s went offline", self.base_url)
+        self._online = online
+
+    def _update_pit_stats(self, now):
+        """Fold the last device sample, without the state of unconfirmed commands, into the pit statistics and record whether their rounded values changed."""
+        rounded = self._pit_stats.rounded
+        self._pit_stats.add(now, self._device_data)
+
+        if self._pit_stats.rounded != rounded:
+            self._changed.add("pit_stats")
+
+    def _update_poll_interval(self, poll_interval):
+        """Store the poll interval and record whether it changed."""
+        if poll_interval != self._poll_interval:
+            self._changed.add("poll_interval")
+        self._poll_interval = poll_interval
+
+    def _update_probe_etas(self, now):
+        """Fold the last sample into the done-time estimators and record which estimates changed."""
+        for probe, estimator in self._eta_estimators.items():
+            estimator.update()
+            eta = estimator.eta(getattr(self._data, f"probe_{probe}"), getattr(self, f"_probe_{probe}_target_temperature"), now)
+
+            if eta is not None:
+                eta = round(eta / 60) * 60
+
+            if eta != self._probe_eta[probe]:
+                self._changed.add(f"probe_{probe}_eta")
+                self._probe_eta[probe] = eta
+
+    def _update_starting(self, starting):
+        """Store the starting status and record whether it changed."""
+        if starting != self._starting:
+            self._changed.add("starting")
+        self._starting = starting
+
+    def _update_starting_end_time(self, starting_end_time):
+        """Store the Fire It Up deadline and record whether it changed."""
+        if starting_end_time != self._starting_end_time:
+            self._changed.add("starting_end_time")
+        self._starting_end_time = starting_end_time
 
-            if response.status_code in GOOD_HTTP_CODES:
-                result = parse_qs(response.text)
-                self._info = result
-                self._online = True
-                #_LOGGER.info("self._info = %s", self._info)
+    async def get_info(self):
+        """Get iKamand info."""
+        try:
+            text = await self._request("GET", "info")
+
+            if text is not None:
+                identity = (self.mac_address, self.firmware_version)
+                self._info = parse_qs(text)
+                self._info_fetched = True
+                if (self.mac_address, self.firmware_version) != identity:
+                    self._changed.add("info")
+                self._update_online(True)
+                _LOGGER.debug("self._info = %s", self._info)
             else:
-                self._online = False
+                self._metrics.bad_status += 1
+                self._update_online(False)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self._metrics.record_error(err)
+            self._update_online(False)
+
+    @property
+    def runtime_state(self):
+        """Return the settings and Fire It Up state that only live in this client, to be saved."""
+        return {
+            "probe_target_temperatures": [getattr(self, f"_probe_{probe}_target_temperature") for probe in (1, 2, 3)],
+            "set_fan_duration": self._set_fan_duration,
+            "starting": self._starting,
+            "starting_end_time": self._starting_end_time,
+            "program": None if self._program is None else self._program.as_dict(),
+        }
 
-        except (requests.RequestException, asyncio.TimeoutError):
-            self._online = False
+    def restore_state(self, state):
+        """Restore a saved runtime_state, rescheduling the end of a Fire It Up still in progress."""
+        for probe, temperature in enumerate(state.get("probe_target_temperatures", ()), 1):
+            setattr(self, f"_probe_{probe}_target_temperature", temperature)
+
+        self._set_fan_duration = state.get("set_fan_duration", self._set_fan_duration)
+
+        if state.get("starting"):
+            self._starting = True
+            self._starting_end_time = state["starting_end_time"]
+            self._schedule_starting_timer()
+
+        if state.get("program"):
+            self._program = CookProgram.from_dict(state["program"])
+
+    def restore_info(self, mac_address, firmware_version):
+        """Seed the device identity cached from an earlier get_info, which the first poll refreshes."""
+        self._info = {MAC_ADDRESS: [mac_address], FW_VERSION: [firmware_version]}
 
     async def get_data(self):
         """Get iKamand data."""
-        url = f"{self.base_url}data"
-
         while True:
-            loop = asyncio.get_running_loop()
+            await self.async_update()
+            await self.wait_next_poll()
+
+    def set_fan_duration_minutes(self, minutes):
+        """Set the Fire It Up duration, in minutes."""
+        if minutes != self._set_fan_duration:
+            self._changed.add("set_fan_duration")
+        self._set_fan_duration = minutes
+        self._notify_listeners()
+
+    def set_probe_target_temperature(self, probe, temperature):
+        """Set the target temperature of a probe (1 to 3)."""
+        if temperature != getattr(self, f"_probe_{probe}_target_temperature"):
+            self._changed.add(f"probe_{probe}_target_temperature")
+        setattr(self, f"_probe_{probe}_target_temperature", temperature)
+        self._notify_listeners()
+
+    def start_program(self, steps):
+        """Run a cook program, replacing the current one; its first steps run at once."""
+        self._program = CookProgram(steps)
+        self._changed.add("program")
+        self._notify_listeners()
+        self.request_refresh()
+
+    def stop_program(self):
+        """Stop the cook program, leaving the cook as it is."""
+        if self._program is not None:
+            self._program = None
+            self._changed.add("program")
+            self._notify_listeners()
+
+    def _run_program(self, now, data):
+        """Advance the cook program against a new snapshot and send the commands of the steps due."""
+        if self._program is None:
+            return
+
+        index, sent_target = self._program.index, self._program.sent_target
+        commands = self._program.advance(now, data)
+
+        if (self._program.index, self._program.sent_target) != (index, sent_target):
+            self._changed.add("program")
+
+        if self._program.done:
+            _LOGGER.info("iKamand at %s finished its cook program", self.base_url)
+            self._program = None
+
+        if commands:
+            task = asyncio.get_running_loop().create_task(self._send_program_commands(commands))
+            self._program_tasks.add(task)
+            task.add_done_callback(self._program_tasks.discard)
+
+    async def _send_program_commands(self, commands):
+        """Send the commands of program steps, in order."""
+        for method, *args in commands:
+            if method == "start_cooking":
+                probe, temperature = args
+                self.set_probe_target_temperature(probe, temperature)
+                await self.start_cooking(probe)
+            else:
+                await getattr(self, method)(*args)
 
-            try:
-                response = await loop.run_in_executor(None, lambda: requests.get(url, timeout=10))
+    def set_recorder(self, recorder):
+        """Record every data sample and command to a session recorder, or stop recording with None."""
+        self._recorder = recorder
 
-                if response.status_code in GOOD_HTTP_CODES:
-                    result = parse_qs(response.text)
+    def request_refresh(self):
+        """Poll again now instead of waiting for the end of the poll interval."""
+        self._refresh.set()
 
-                    if 'time' in result and int(result['time'][0]) < 40:
-                        self._data = {}
-                        self._online = False
-                    else:
-                        if not self._online or abs(int(result['time'][0]) - int(time.time())) > 60:
-                            await self.connection_recovery()
-                        else:
-                            self._data = self._data_bck = result
-                            self._online = True
-                            #_LOGGER.info("self._data = %s", self._data)
-                else:
-                    self._data = {}
-                    self._online = False
+    async def wait_next_poll(self):
+        """Wait for the poll interval to elapse or for a refresh to be requested."""
+        try:
+            await asyncio.wait_for(self._refresh.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+        self._refresh.clear()
 
-            except (requests.RequestException, asyncio.TimeoutError):
-                self._online = False
+    async def async_update(self):
+        """Poll iKamand data once, fetching its info first if not done yet."""
+        if not self._info_fetched:
+            await self.get_info()
 
-            if self._starting and int(time.time()) >= self._starting_end_time:
-                await self.shut_it_down()
+            if not self._info_fetched:
+                self._scheduler.record_failure()
+                self._update_poll_interval(self._scheduler.next_interval(self._data, self._starting, self._online))
+                self._notify_listeners()
+                return
 
-            await asyncio.sleep(5)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        try:
+            text = await self._request("GET", "data")
+            self._metrics.poll_latency.add(loop.time() - start)
+
+            if text is not None:
+                if self._recorder is not None:
+                    self._recorder.record_data(self._clock(), text)
+
+                parse_start = time.perf_counter()
+                result = parse_snapshot(text)
+                self._metrics.parse_time.add(time.perf_counter() - parse_start)
+                self._scheduler.record_success()
+
+                if result.uptime < 40:
+                    self._update_data(EMPTY_SNAPSHOT)
+                    self._update_online(False)
+                else:
+                    if not self._online or abs(result.uptime - int(self._clock())) > 60:
+                        await self.connection_recovery()
+                    else:
+                        self._update_data(result)
+                        self._data_bck = result
+                        self._update_online(True)
+                        now = self._clock()
+                        self._history.append(now, result)
+                        self._update_probe_etas(now)
+                        self._update_pit_stats(now)
+                        self._run_program(now, result)
+
+                        for pending in self._confirmations.values():
+                            pending.check(result)
+                        _LOGGER.debug("self._data = %s", self._data)
+            else:
+                self._metrics.bad_status += 1
+                self._update_data(EMPTY_SNAPSHOT)
+                self._update_online(False)
+                self._scheduler.record_failure()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            self._metrics.record_error(err)
+            self._update_online(False)
+            self._scheduler.record_failure()
+
+        self._changed.add("metrics")
+        self._update_poll_interval(self._scheduler.next_interval(self._data, self._starting, self._online))
+        self._notify_listeners()
 
     async def post_commands(self, payload):
-        """Send commands to iKamand."""
-        url = f"{self.base_url}cook"
+        """Send commands to iKamand, showing their expected state at once, return True if the request that carried them succeeded."""
+        expected = expected_state(payload)
+        self._show_optimistic(expected)
+        self._notify_listeners()
+
+        try:
+            result = await self._commands.submit(payload)
+        except BaseException:
+            self._drop_optimistic(expected)
+            raise
+
+        if result:
+            self._track_command(payload, expected)
+        else:
+            self._drop_optimistic(expected)
+            self._notify_listeners()
+
+        return result
+
+    def _track_command(self, payload, expected):
+        """Follow a sent command until the device data confirms it, replacing older commands on the same fields."""
+        if not expected:
+            return
+
+        for task, pending in list(self._confirmations.items()):
+            if not pending.expected.keys().isdisjoint(expected):
+                task.cancel()
+
         loop = asyncio.get_running_loop()
+        pending = PendingCommand(payload, expected, loop.create_future())
+        task = loop.create_task(self._confirm_command(pending))
+        self._confirmations[task] = pending
+        task.add_done_callback(self._on_command_done)
+
+    def _on_command_done(self, task):
+        """Stop showing the state of a confirmed, failed or superseded command, even one cancelled before it started."""
+        pending = self._confirmations.pop(task)
+
+        if task.cancelled():
+            self._update_last_command("superseded", pending.attempts, None)
+
+        self._drop_optimistic(pending.expected)
+        self._notify_listeners()
+
+    async def _confirm_command(self, pending):
+        """Read the data back until it shows the command, resending it on a bounded schedule."""
+        start = asyncio.get_running_loop().time()
+
+        for timeout in COMMAND_CONFIRM_TIMEOUTS:
+            if pending.attempts:
+                pending.payload = self._resend_payload(pending.payload)
+                await self._commands.submit(pending.payload)
+
+            pending.attempts += 1
+            self.request_refresh()
+
+            try:
+                await asyncio.wait_for(asyncio.shield(pending.future), timeout)
+            except asyncio.TimeoutError:
+                continue
+
+            self._update_last_command("confirmed", pending.attempts, asyncio.get_running_loop().time() - start)
+            return
+
+        _LOGGER.warning("iKamand at %s did not apply command %s", self.base_url, pending.payload)
+        self._update_last_command("failed", pending.attempts, None)
+
+    def _resend_payload(self, payload):
+        """Return a payload to resend, its current time and a default 24-hour end time rebuilt from now."""
+        if CURRENT_TIME not in payload:
+            return payload
 
-        #_LOGGER.info("post_commands payload = %s", payload)
+        current_time = int(self._clock())
+        resend = {**payload, CURRENT_TIME: current_time}
+
+        if payload.get(COOK_END_TIME) == payload[CURRENT_TIME] + 86400:
+            resend[COOK_END_TIME] = current_time + 86400
+
+        return resend
+
+    async def _post_commands(self, payload):
+        """Post one payload to iKamand."""
+        _LOGGER.debug("post_commands payload = %s", payload)
+
+        if self._recorder is not None:
+            self._recorder.record_command(self._clock(), payload)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
 
         try:
-            response = await loop.run_in_executor(None, lambda: requests.post(url, headers=self.headers, data=payload, timeout=10))
+            text = await self._request("POST", "cook", headers=self.headers, data=payload)
 
-            if response.status_code in GOOD_HTTP_CODES:
-                self._online = True
+            if text is not None:
+                self._metrics.command_latency.add(loop.time() - start)
+                self._update_online(True)
             else:
-                self._online = False
+                self._metrics.bad_status += 1
+                self._update_online(False)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self._metrics.record_error(err)
+            self._update_online(False)
 
-        except (requests.RequestException, asyncio.TimeoutError):
-            self._online = False
+        self._notify_listeners()
+        return self._online
 
     async def start_ikamand(self, target_pit_temp: int):
         """Start the iKamand."""
-        current_time = int(time.time())
+        current_time = int(self._clock())
         payload = {
             COOK_START: 1,
             COOK_ID: "",
@@ -140,11 +571,11 @@ class Ikamand:
             CURRENT_TIME: current_time,
         }
 
-        await self.post_commands(payload)
+        return await self.post_commands(payload)
 
     async def stop_ikamand(self):
         """Stop the iKamand."""
-        current_time = int(time.time())
+        current_time = int(self._clock())
         payload = {
             COOK_START: 0,
             COOK_ID: "",
@@ -156,13 +587,15 @@ class Ikamand:
             CURRENT_TIME: current_time,
         }
 
-        self._starting = False
+        self._update_starting(False)
+        self._update_starting_end_time(0)
+        self._cancel_starting_timer()
 
-        await self.post_commands(payload)
+        return await self.post_commands(payload)
 
     async def start_cooking(self, food_probe: int):
         """Start cooking."""
-        current_time = int(time.time())
+        current_time = int(self._clock())
         payload = {
             COOK_START: 1,
             COOK_ID: food_probe,
@@ -171,11 +604,52 @@ class Ikamand:
         }
 
         if self.cooking:
-            await self.post_commands(payload)
+            return await self.post_commands(payload)
+        return False
+
+    async def set_pit_target(self, target_pit_temp: int):
+        """Start the iKamand or change its pit target, keeping the food probe and target of the running cook."""
+        current_time = int(self._clock())
+        food_probe = self._data.food_probe if self._data.cooking else 0
+        payload = {
+            COOK_START: 1,
+            COOK_ID: food_probe or "",
+            TARGET_PIT_TEMP: target_pit_temp,
+            COOK_END_TIME: current_time + 86400,
+            FOOD_PROBE: food_probe,
+            TARGET_FOOD_TEMP: self._data.target_food_temp if food_probe else 0,
+            UNKNOWN_SEND_VAR1: 0,
+            CURRENT_TIME: current_time,
+        }
+
+        return await self.post_commands(payload)
+
+    async def configure_cook(self, target_pit_temp: int, food_probe: int = 0, probe_targets=None, end_time=None):
+        """Start a cook with its pit target, food probe and end time in one command, storing the probe targets."""
+        for probe, temperature in (probe_targets or {}).items():
+            self.set_probe_target_temperature(probe, temperature)
+
+        current_time = int(self._clock())
+        payload = {
+            COOK_START: 1,
+            COOK_ID: food_probe or "",
+            TARGET_PIT_TEMP: target_pit_temp,
+            COOK_END_TIME: current_time + 86400 if end_time is None else int(end_time),
+            FOOD_PROBE: food_probe,
+            TARGET_FOOD_TEMP: getattr(self, f"probe_{food_probe}_target_temperature") if food_probe else 0,
+            UNKNOWN_SEND_VAR1: 0,
+            CURRENT_TIME: current_time,
+        }
+
+        self._update_starting(False)
+        self._update_starting_end_time(0)
+        self._cancel_starting_timer()
+
+        return await self.post_commands(payload)
 
     async def fire_it_up(self):
         """Start the iKamand fan at 100% for the selected duration."""
-        current_time = int(time.time())
+        current_time = int(self._clock())
         payload = {
             COOK_START: 1,
             COOK_ID: "",
@@ -187,14 +661,15 @@ class Ikamand:
             CURRENT_TIME: current_time,
         }
 
-        self._starting = True
-        self._starting_end_time = payload[COOK_END_TIME]
+        self._update_starting(True)
+        self._update_starting_end_time(payload[COOK_END_TIME])
+        self._schedule_starting_timer()
 
-        await self.post_commands(payload)
+        return await self.post_commands(payload)
 
     async def shut_it_down(self):
         """Stop the iKamand fan."""
-        current_time = int(time.time())
+        current_time = int(self._clock())
         payload = {
             COOK_START: 0,
             COOK_ID: "",
@@ -206,25 +681,45 @@ class Ikamand:
             CURRENT_TIME: current_time,
         }
 
-        self._starting = False
-        self._starting_end_time = 0
+        self._update_starting(False)
+        self._update_starting_end_time(0)
+        self._cancel_starting_timer()
+
+        return await self.post_commands(payload)
+
+    def _schedule_starting_timer(self):
+        """Schedule shut_it_down at the Fire It Up deadline, independently of polling."""
+        self._cancel_starting_timer()
+        loop = asyncio.get_running_loop()
+        self._starting_timer = loop.call_later(max(0, self._starting_end_time - self._clock()), self._on_starting_timer)
+
+    def _cancel_starting_timer(self):
+        """Cancel the scheduled end of Fire It Up, if any."""
+        if self._starting_timer is not None:
+            self._starting_timer.cancel()
+            self._starting_timer = None
 
-        await self.post_commands(payload)
+    def _on_starting_timer(self):
+        """Shut the fan down at the Fire It Up deadline."""
+        self._starting_timer = None
+        self._starting_task = asyncio.get_running_loop().create_task(self.shut_it_down())
 
     async def connection_recovery(self):
         """Restart iKamand Cook."""
-        current_time = int(time.time())
+        current_time = int(self._clock())
+        self._metrics.recoveries += 1
 
         if self._starting:
             cook_end_time = self._starting_end_time
         else:
             cook_end_time = current_time + 86400
 
-        if current_time - int(self._data_bck['time'][0]) < 600 and int(self._data_bck['acs'][0]):
+        if current_time - self._data_bck.uptime < 600 and self._data_bck.cooking:
+            _LOGGER.info("iKamand at %s recovered, resuming the cook at %s", self.base_url, self._data_bck.target_pit_temp)
             payload = {
                 COOK_START: 1,
                 COOK_ID: "",
-                TARGET_PIT_TEMP: int(self._data_bck.get(TARGET_PIT_TEMP, [0])[0]),
+                TARGET_PIT_TEMP: self._data_bck.target_pit_temp,
                 COOK_END_TIME: cook_end_time,
                 FOOD_PROBE: 0,
                 TARGET_FOOD_TEMP: 0,
@@ -232,6 +727,7 @@ class Ikamand:
                 CURRENT_TIME: current_time,
             }
         else:
+            _LOGGER.info("iKamand at %s recovered, stopping the cook", self.base_url)
             payload = {
                 COOK_START: 0,
                 COOK_ID: "",
@@ -243,12 +739,12 @@ class Ikamand:
                 CURRENT_TIME: current_time,
             }
 
-        await self.post_commands(payload)
+        return await self.post_commands(payload)
 
     @property
     def cooking(self):
         """Return cooking status."""
-        return self._data.get(COOK_START, [0])[0] == "1"
+        return self._data.cooking
 
     @property
     def data(self):
@@ -258,18 +754,38 @@ class Ikamand:
     @property
     def fan_speed(self):
         """Return current fan speed %."""
-        return int(self._data.get(FAN_SPEED, ["0"])[0])
+        return self._data.fan_speed
 
     @property
     def firmware_version(self):
         """Return device firmware version."""
         return self._info.get(FW_VERSION, [0])[0]
 
+    @property
+    def history(self):
+        """Return the recent telemetry samples."""
+        return self._history
+
+    @property
+    def last_command(self):
+        """Return the outcome of the last tracked command: status, attempts and confirmation latency."""
+        return self._last_command
+
     @property
     def mac_address(self):
         """Return device MAC address."""
         return self._info.get(MAC_ADDRESS, [0])[0]
 
+    @property
+    def metrics(self):
+        """Return the runtime metrics."""
+        return self._metrics
+
+    @property
+    def program(self):
+        """Return the running cook program, None if there is none."""
+        return self._program
+
     @property
     def online(self):
         """Return if reachable."""
@@ -278,20 +794,27 @@ class Ikamand:
     @property
     def pit_temp(self):
         """Return current pit temperature."""
-        return (
-            int(self._data.get(PIT_TEMP, ["400"])[0])
-            if self._data.get(PIT_TEMP, ["400"])[0] not in FALSE_TEMPS
-            else None
-        )
+        return self._data.pit_temp
+
+    @property
+    def pit_stats(self):
+        """Return the pit-control statistics of the current cook."""
+        return self._pit_stats
+
+    @property
+    def poll_interval(self):
+        """Return the current delay between two polls, in seconds."""
+        return self._poll_interval
 
     @property
     def probe_1(self):
         """Return current temperature of probe 1."""
-        return (
-            int(self._data.get(PROBE_1, ["400"])[0])
-            if self._data.get(PROBE_1, ["400"])[0] not in FALSE_TEMPS
-            else None
-        )
+        return self._data.probe_1
+
+    @property
+    def probe_1_eta(self):
+        """Return the estimated timestamp at which probe 1 reaches its target."""
+        return self._probe_eta[1]
 
     @property
     def probe_1_target_temperature(self):
@@ -301,11 +824,12 @@ class Ikamand:
     @property
     def probe_2(self):
         """Return current temperature of probe 2."""
-        return (
-            int(self._data.get(PROBE_2, ["400"])[0])
-            if self._data.get(PROBE_2, ["400"])[0] not in FALSE_TEMPS
-            else None
-        )
+        return self._data.probe_2
+
+    @property
+    def probe_2_eta(self):
+        """Return the estimated timestamp at which probe 2 reaches its target."""
+        return self._probe_eta[2]
 
     @property
     def probe_2_target_temperature(self):
@@ -315,11 +839,12 @@ class Ikamand:
     @property
     def probe_3(self):
         """Return current temperature of probe 3."""
-        return (
-            int(self._data.get(PROBE_3, ["400"])[0])
-            if self._data.get(PROBE_3, ["400"])[0] not in FALSE_TEMPS
-            else None
-        )
+        return self._data.probe_3
+
+    @property
+    def probe_3_eta(self):
+        """Return the estimated timestamp at which probe 3 reaches its target."""
+        return self._probe_eta[3]
 
     @property
     def probe_3_target_temperature(self):
@@ -339,4 +864,4 @@ class Ikamand:
     @property
     def target_pit_temp(self):
         """Return target pit temperature."""
-        return int(self._data.get(TARGET_PIT_TEMP, [0])[0])
+        return self._data.target_pit_temp
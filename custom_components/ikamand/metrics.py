@@ -0,0 +1,129 @@
+"""iKamand runtime metrics."""
+import asyncio
+import bisect
+
+from .breaker import CircuitOpenError
+from .const import METRICS_LATENCY_BUCKETS, METRICS_PARSE_BUCKETS
+
+
+class LatencyHistogram:
+    """Count durations in fixed buckets, keeping their sum and maximum, in O(log buckets) per sample."""
+
+    def __init__(self, bounds=METRICS_LATENCY_BUCKETS):
+        """Initialize the histogram with the upper bounds of its buckets, in seconds."""
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._max = 0.0
+        self._sum = 0.0
+
+    def add(self, seconds):
+        """Add a duration."""
+        self._counts[bisect.bisect_left(self._bounds, seconds)] += 1
+        self._count += 1
+        self._max = max(self._max, seconds)
+        self._sum += seconds
+
+    @property
+    def count(self):
+        """Return the number of durations."""
+        return self._count
+
+    @property
+    def max(self):
+        """Return the longest duration."""
+        return self._max if self._count else None
+
+    @property
+    def mean(self):
+        """Return the average duration."""
+        return self._sum / self._count if self._count else None
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket holding the q quantile, the maximum for the last bucket."""
+        if not self._count:
+            return None
+
+        rank = q * self._count
+        seen = 0
+
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self._max)
+        return self._max
+
+    def as_dict(self):
+        """Return the histogram as plain data."""
+        buckets = {f"le_{bound:g}": count for bound, count in zip(self._bounds, self._counts)}
+        buckets["inf"] = self._counts[-1]
+        return {
+            "count": self._count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class IkamandMetrics:
+    """Counters and latency histograms describing how a device, the network and the host behave."""
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self.bad_status = 0
+        self.command_latency = LatencyHistogram()
+        self.connection_errors = 0
+        self.last_transition = None
+        self.parse_errors = 0
+        self.parse_time = LatencyHistogram(METRICS_PARSE_BUCKETS)
+        self.poll_latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.recoveries = 0
+        self.short_circuited = 0
+        self.timeouts = 0
+        self.went_offline = 0
+        self.went_online = 0
+
+    @property
+    def errors(self):
+        """Return the number of failed requests."""
+        return self.bad_status + self.connection_errors + self.parse_errors + self.timeouts
+
+    def record_error(self, err):
+        """Count a failed request by cause, requests failed fast being counted when refused."""
+        if isinstance(err, CircuitOpenError):
+            return
+        if isinstance(err, asyncio.TimeoutError):
+            self.timeouts += 1
+        elif isinstance(err, ValueError):
+            self.parse_errors += 1
+        else:
+            self.connection_errors += 1
+
+    def record_transition(self, online, timestamp):
+        """Count a change of reachability."""
+        if online:
+            self.went_online += 1
+        else:
+            self.went_offline += 1
+        self.last_transition = timestamp
+
+    def as_dict(self):
+        """Return the metrics as plain data."""
+        return {
+            "poll_latency": self.poll_latency.as_dict(),
+            "poll_queue_wait": self.queue_wait.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+            "command_latency": self.command_latency.as_dict(),
+            "timeouts": self.timeouts,
+            "connection_errors": self.connection_errors,
+            "bad_status": self.bad_status,
+            "parse_errors": self.parse_errors,
+            "short_circuited": self.short_circuited,
+            "recoveries": self.recoveries,
+            "went_online": self.went_online,
+            "went_offline": self.went_offline,
+            "last_transition": self.last_transition,
+        }
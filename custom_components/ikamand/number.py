@@ -1,12 +1,9 @@
 """iKamand numbers."""
 from . import iKamandDevice
-from .const import _LOGGER, API, DOMAIN
-from datetime import timedelta
+from .const import _LOGGER, API, DOMAIN, FAN_DURATION_MAX, PROBE_TEMP_MAX, PROBE_TEMP_MAX_F
 from homeassistant.const import UnitOfTemperature
 from homeassistant.components.number import NumberEntity, NumberDeviceClass
 
-SCAN_INTERVAL = timedelta(seconds=5)
-
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup the iKamand numbers."""
@@ -28,6 +25,7 @@ class SetFanDuration(iKamandDevice, NumberEntity):
     def __init__(self, ikamand, config_entry):
         """Initialise the device."""
         super().__init__(ikamand, config_entry)
+        self._fields = {"online", "set_fan_duration"}
         self._ikamand = ikamand
 
     @property
@@ -48,7 +46,7 @@ class SetFanDuration(iKamandDevice, NumberEntity):
     @property
     def native_max_value(self) -> int:
         """Return the maximum value."""
-        return 30
+        return FAN_DURATION_MAX
 
     @property
     def native_min_value(self) -> int:
@@ -62,7 +60,7 @@ class SetFanDuration(iKamandDevice, NumberEntity):
 
     async def async_set_native_value(self, value: int) -> None:
         """Set value of the number."""
-        self._ikamand._set_fan_duration = int(value)
+        self._ikamand.set_fan_duration_minutes(int(value))
 
     @property
     def available(self) -> bool:
@@ -76,6 +74,7 @@ class ProbeTargetTemperature(iKamandDevice, NumberEntity):
     def __init__(self, item, ikamand, config_entry):
         """Initialise the device."""
         super().__init__(ikamand, config_entry)
+        self._fields = {"online", f"probe_{item}", f"probe_{item}_target_temperature"}
         self._ikamand = ikamand
         self._name = item
         self._sensor_type = NumberDeviceClass.TEMPERATURE
@@ -103,10 +102,9 @@ class ProbeTargetTemperature(iKamandDevice, NumberEntity):
     @property
     def native_max_value(self) -> int:
         """Return the maximum value."""
-        """The iKamand can control between 150°F-500°F (66°C-260°C)"""
         if self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT:
-            return 500
-        return 260
+            return PROBE_TEMP_MAX_F
+        return PROBE_TEMP_MAX
 
     @property
     def native_min_value(self) -> int:
@@ -120,7 +118,7 @@ class ProbeTargetTemperature(iKamandDevice, NumberEntity):
 
     async def async_set_native_value(self, value: int) -> None:
         """Set value of the number."""
-        setattr(self._ikamand, f"_probe_{self._name}_target_temperature", int(value))
+        self._ikamand.set_probe_target_temperature(self._name, int(value))
         await self._ikamand.start_cooking(self._name)
 
     @property
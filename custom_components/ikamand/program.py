@@ -0,0 +1,124 @@
+"""iKamand cook programs."""
+
+STEP_RAMP = "ramp"
+STEP_SET_PIT = "set_pit"
+STEP_START_COOKING = "start_cooking"
+STEP_STOP = "stop"
+STEP_WAIT = "wait"
+STEP_WAIT_PROBE = "wait_probe"
+STEP_WAIT_UNTIL = "wait_until"
+
+STEP_FIELDS = {
+    STEP_RAMP: ("temperature", "duration"),
+    STEP_SET_PIT: ("temperature",),
+    STEP_START_COOKING: ("probe", "temperature"),
+    STEP_STOP: (),
+    STEP_WAIT: ("duration",),
+    STEP_WAIT_PROBE: ("probe", "temperature"),
+    STEP_WAIT_UNTIL: ("time",),
+}
+
+
+class CookProgram:
+    """A sequence of timed or probe-triggered steps, advanced against each new snapshot of one device.
+
+    Steps are plain dicts with a type, temperatures in °C, durations in
+    seconds and times as Unix timestamps, so a program can be saved as is:
+
+    - set_pit: set the pit target to temperature
+    - ramp: move the pit target linearly from its current value to temperature over duration
+    - start_cooking: set the target of probe to temperature and make it the food probe, once a cook is running
+    - wait: wait for duration
+    - wait_until: wait until time
+    - wait_probe: wait until probe reaches temperature
+    - stop: stop the cook
+    """
+
+    def __init__(self, steps, index=0, step_start=None, ramp_from=None, sent_target=None):
+        """Initialize the program, at its first step unless resumed."""
+        self.steps = [dict(step) for step in steps]
+        self.index = index
+        self.step_start = step_start
+        self.ramp_from = ramp_from
+        self.sent_target = sent_target
+
+    @classmethod
+    def from_dict(cls, state):
+        """Return a program resumed from as_dict()."""
+        return cls(**state)
+
+    def as_dict(self):
+        """Return the program and its progress as plain data."""
+        return {
+            "steps": self.steps,
+            "index": self.index,
+            "step_start": self.step_start,
+            "ramp_from": self.ramp_from,
+            "sent_target": self.sent_target,
+        }
+
+    @property
+    def done(self):
+        """Return True once every step has run."""
+        return self.index >= len(self.steps)
+
+    @property
+    def step(self):
+        """Return the current step, None once done."""
+        return None if self.done else self.steps[self.index]
+
+    def advance(self, now, data):
+        """Run the steps due for a snapshot, return the commands to send as (method, *args) tuples.
+
+        The pit target last commanded by the program is tracked in sent_target,
+        so a step does not wait for the device to show the previous one.
+        """
+        commands = []
+
+        while not self.done:
+            step = self.steps[self.index]
+            kind = step["type"]
+
+            if self.step_start is None:
+                self.step_start = now
+                if self.sent_target is None and data.cooking:
+                    self.sent_target = data.target_pit_temp
+                self.ramp_from = step.get("temperature") if self.sent_target is None else self.sent_target
+
+            if kind == STEP_SET_PIT:
+                self.sent_target = step["temperature"]
+                commands.append(("set_pit_target", step["temperature"]))
+            elif kind == STEP_START_COOKING:
+                if not data.cooking and self.sent_target is None:
+                    break
+                commands.append(("start_cooking", step["probe"], step["temperature"]))
+            elif kind == STEP_STOP:
+                self.sent_target = None
+                commands.append(("stop_ikamand",))
+            elif kind == STEP_RAMP:
+                elapsed = now - self.step_start
+
+                if elapsed < step["duration"]:
+                    target = round(self.ramp_from + (step["temperature"] - self.ramp_from) * elapsed / step["duration"])
+                    if target != self.sent_target:
+                        self.sent_target = target
+                        commands.append(("set_pit_target", target))
+                    break
+                if step["temperature"] != self.sent_target:
+                    self.sent_target = step["temperature"]
+                    commands.append(("set_pit_target", step["temperature"]))
+            elif kind == STEP_WAIT:
+                if now - self.step_start < step["duration"]:
+                    break
+            elif kind == STEP_WAIT_UNTIL:
+                if now < step["time"]:
+                    break
+            elif kind == STEP_WAIT_PROBE:
+                temperature = getattr(data, f"probe_{step['probe']}")
+                if temperature is None or temperature < step["temperature"]:
+                    break
+
+            self.index += 1
+            self.step_start = None
+
+        return commands
@@ -0,0 +1,242 @@
+"""iKamand cook-session recorder."""
+import contextlib
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from .const import (
+    _LOGGER,
+    COOK_END_TIME,
+    COOK_ID,
+    COOK_START,
+    CURRENT_TIME,
+    FAN_SPEED,
+    FOOD_PROBE,
+    PIT_TEMP,
+    PROBE_1,
+    PROBE_2,
+    PROBE_3,
+    RECORDER_FSYNC_INTERVAL,
+    TARGET_FOOD_TEMP,
+    TARGET_PIT_TEMP,
+    UNKNOWN_RECEIVE_VAR1,
+    UNKNOWN_RECEIVE_VAR2,
+    UNKNOWN_RECEIVE_VAR3,
+    UNKNOWN_SEND_VAR1,
+    UPTIME,
+)
+from urllib.parse import parse_qsl
+
+MAGIC = b"IKREC\x00\x02\x00"
+RECORD = struct.Struct("<B3xd15iI")
+RECORD_DATA = 1
+RECORD_COMMAND = 2
+MISSING = -(2**31)
+
+COMMAND_KEYS = (COOK_START, COOK_ID, TARGET_PIT_TEMP, COOK_END_TIME, FOOD_PROBE, TARGET_FOOD_TEMP, UNKNOWN_SEND_VAR1, CURRENT_TIME)
+DATA_KEYS = (
+    UPTIME,
+    COOK_START,
+    COOK_ID,
+    PIT_TEMP,
+    PROBE_1,
+    PROBE_2,
+    PROBE_3,
+    FAN_SPEED,
+    TARGET_PIT_TEMP,
+    COOK_END_TIME,
+    FOOD_PROBE,
+    TARGET_FOOD_TEMP,
+    UNKNOWN_RECEIVE_VAR1,
+    UNKNOWN_RECEIVE_VAR2,
+    UNKNOWN_RECEIVE_VAR3,
+)
+
+
+def open_session_recorder(directory, mac_address):
+    """Open the session log of a device in directory, creating the directory if needed."""
+    os.makedirs(directory, exist_ok=True)
+    return SessionRecorder(os.path.join(directory, f"{mac_address.replace(':', '').lower()}.ikrec"))
+
+
+def _integer(value):
+    """Return a form value as an integer, MISSING if it is absent, empty or not an integer."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _pack(kind, timestamp, values):
+    """Return one record, its checksum covering every byte before it."""
+    record = RECORD.pack(kind, timestamp, *values, 0)
+    return record[:-4] + struct.pack("<I", zlib.crc32(record[:-4]))
+
+
+def _valid(record):
+    """Return True if a record matches its checksum."""
+    return zlib.crc32(record[:-4]) == struct.unpack_from("<I", record, RECORD.size - 4)[0]
+
+
+class SessionRecorder:
+    """Append every data sample and command of a device to a fixed-width binary log.
+
+    Each record carries a CRC32, so a crash can only leave torn, zeroed or
+    garbage records at the end, which are cut off back to the last valid
+    one when the file is reopened; a log of another format version is
+    moved aside to a .old file. Records are written by a background thread
+    and synced to disk at least every fsync_interval seconds, which bounds
+    what a power loss can take; if writing fails, recording stops. Opening
+    and closing block: create and close the recorder in an executor.
+    """
+
+    def __init__(self, path, fsync_interval=RECORDER_FSYNC_INTERVAL):
+        """Open the log for appending, creating it or trimming invalid last records, and start its writer."""
+        new = not os.path.exists(path) or os.path.getsize(path) < len(MAGIC)
+
+        if not new:
+            with open(path, "rb") as file:
+                if file.read(len(MAGIC)) != MAGIC:
+                    os.replace(path, f"{path}.old")
+                    new = True
+
+        self._failed = False
+        self._file = open(path, "wb" if new else "r+b")
+        self._fsync_interval = fsync_interval
+        self._queue = queue.SimpleQueue()
+        self.path = path
+
+        if new:
+            self._file.write(MAGIC)
+        else:
+            size = os.path.getsize(path)
+            end = size - (size - len(MAGIC)) % RECORD.size
+
+            while end > len(MAGIC):
+                self._file.seek(end - RECORD.size)
+                if _valid(self._file.read(RECORD.size)):
+                    break
+                end -= RECORD.size
+
+            self._file.truncate(end)
+            self._file.seek(end)
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._writer = threading.Thread(target=self._write_records, name=f"ikamand recorder {os.path.basename(path)}", daemon=True)
+        self._writer.start()
+
+    def record_data(self, timestamp, text):
+        """Append a raw cgi-bin/data response body; missing, empty or non-integer values are stored as MISSING."""
+        values = dict(parse_qsl(text.strip(), keep_blank_values=True))
+        self._write(_pack(RECORD_DATA, timestamp, [_integer(values.get(key)) for key in DATA_KEYS]))
+
+    def record_command(self, timestamp, payload):
+        """Append a cgi-bin/cook payload; missing, empty or non-integer values are stored as MISSING."""
+        values = [_integer(payload.get(key)) for key in COMMAND_KEYS]
+        self._write(_pack(RECORD_COMMAND, timestamp, values + [MISSING] * (len(DATA_KEYS) - len(values))))
+
+    def _write(self, record):
+        """Queue a record for the writer thread, without blocking, unless writing failed."""
+        if not self._failed:
+            self._queue.put(record)
+
+    def _write_records(self):
+        """Write queued records in batches until closed, syncing them at least every fsync_interval seconds."""
+        synced = time.monotonic()
+
+        while True:
+            records = [self._queue.get()]
+
+            while not self._queue.empty():
+                records.append(self._queue.get_nowait())
+
+            closing = records[-1] is None
+
+            if closing:
+                records.pop()
+
+            try:
+                self._file.write(b"".join(records))
+                self._file.flush()
+
+                if closing or time.monotonic() - synced >= self._fsync_interval:
+                    os.fsync(self._file.fileno())
+                    synced = time.monotonic()
+            except OSError as err:
+                _LOGGER.error("Stopped recording the session log %s: %s", self.path, err)
+                self._failed = True
+                return
+
+            if closing:
+                return
+
+    def close(self):
+        """Write and sync the queued records, then close the log."""
+        self._queue.put(None)
+        self._writer.join()
+
+        if self._failed:
+            with contextlib.suppress(OSError):
+                self._file.close()
+        else:
+            self._file.close()
+
+
+class SessionReader:
+    """Iterate over a session log through a memory map, without copying it."""
+
+    def __init__(self, path, verify=True):
+        """Map the log; with verify, reading stops at the first corrupted record."""
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an iKamand session log")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._mmap) - len(MAGIC)
+        self._view = memoryview(self._mmap)[len(MAGIC):len(MAGIC) + size - size % RECORD.size]
+        self._verify = verify
+
+    def __enter__(self):
+        """Return the reader."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Release the memory map."""
+        self.close()
+
+    def __len__(self):
+        """Return the number of complete records."""
+        return len(self._view) // RECORD.size
+
+    def close(self):
+        """Release the memory map."""
+        self._view.release()
+        self._mmap.close()
+
+    def records(self):
+        """Yield (kind, timestamp, values) for every record."""
+        view = self._view
+        offset = 0
+
+        for kind, timestamp, *values, crc in RECORD.iter_unpack(view):
+            if self._verify and zlib.crc32(view[offset:offset + RECORD.size - 4]) != crc:
+                return
+            offset += RECORD.size
+            yield kind, timestamp, values
+
+    def samples(self):
+        """Yield (timestamp, values) for every data sample, values keyed as in the response body, without the missing ones."""
+        for kind, timestamp, values in self.records():
+            if kind == RECORD_DATA:
+                yield timestamp, {key: value for key, value in zip(DATA_KEYS, values) if value != MISSING}
+
+    def commands(self):
+        """Yield (timestamp, payload) for every command, without the missing keys."""
+        for kind, timestamp, values in self.records():
+            if kind == RECORD_COMMAND:
+                yield timestamp, {key: value for key, value in zip(COMMAND_KEYS, values) if value != MISSING}
@@ -0,0 +1,50 @@
+"""iKamand poll scheduler."""
+import random
+
+from .const import (
+    POLL_INTERVAL_BACKOFF_MAX,
+    POLL_INTERVAL_FAST,
+    POLL_INTERVAL_IDLE,
+    POLL_INTERVAL_NORMAL,
+    POLL_NEAR_TARGET,
+)
+
+
+class PollScheduler:
+    """Pick the delay before the next poll from the cook phase and link health."""
+
+    def __init__(self):
+        """Initialize the scheduler."""
+        self._failures = 0
+
+    @property
+    def failures(self):
+        """Return the number of consecutive failed polls."""
+        return self._failures
+
+    def record_success(self):
+        """Record a poll that got an answer from the device."""
+        self._failures = 0
+
+    def record_failure(self):
+        """Record a poll that timed out or got a bad answer."""
+        self._failures += 1
+
+    def next_interval(self, data, starting, online=True):
+        """Return the number of seconds to wait before the next poll; a device answering while offline is rebooting."""
+        if self._failures:
+            delay = min(POLL_INTERVAL_BACKOFF_MAX, POLL_INTERVAL_NORMAL * 2 ** (self._failures - 1))
+            return delay / 2 + random.uniform(0, delay / 2)
+
+        if starting or not online:
+            return POLL_INTERVAL_FAST
+
+        if data.cooking:
+            if data.pit_temp is not None and abs(data.pit_temp - data.target_pit_temp) > POLL_NEAR_TARGET:
+                return POLL_INTERVAL_FAST
+            return POLL_INTERVAL_NORMAL
+
+        if data.probe_1 is None and data.probe_2 is None and data.probe_3 is None:
+            return POLL_INTERVAL_IDLE
+
+        return POLL_INTERVAL_NORMAL
@@ -1,13 +1,11 @@
 """iKamand sensors."""
 from . import iKamandDevice
 from .const import _LOGGER, API, DOMAIN
-from datetime import timedelta
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.const import EntityCategory, PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_conversion import TemperatureConverter
 
-SCAN_INTERVAL = timedelta(seconds=1)
-
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the iKamand sensors."""
@@ -19,6 +17,12 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     for i in range(0, 3):
         entities.append(iKamandProbeSensor(i + 1, ikamand, config_entry))
+        entities.append(iKamandProbeEtaSensor(i + 1, ikamand, config_entry))
+
+    entities.append(iKamandLastCommandSensor(ikamand, config_entry))
+    entities.append(iKamandPollIntervalSensor(ikamand, config_entry))
+    entities.append(iKamandPollLatencySensor(ikamand, config_entry))
+    entities.append(iKamandPollErrorsSensor(ikamand, config_entry))
 
     async_add_entities(entities, True)
 
@@ -29,6 +33,7 @@ class iKamandFanSensor(iKamandDevice, SensorEntity):
     def __init__(self, item, ikamand, config_entry):
         """Initialize the device."""
         super().__init__(ikamand, config_entry)
+        self._fields = {"fan_speed", "online"}
         self._ikamand = ikamand
         self._name = item
 
@@ -69,6 +74,7 @@ class iKamandProbeSensor(iKamandDevice, SensorEntity):
     def __init__(self, item, ikamand, config_entry):
         """Initialize the device."""
         super().__init__(ikamand, config_entry)
+        self._fields = {"online", f"probe_{item}"}
         self._ikamand = ikamand
         self._name = item
 
@@ -109,3 +115,256 @@ class iKamandProbeSensor(iKamandDevice, SensorEntity):
         if getattr(self._ikamand, f"probe_{self._name}") == None:
             return False
         return self._ikamand.online
+
+
+class iKamandProbeEtaSensor(iKamandDevice, SensorEntity):
+    """Represents a iKamand probe done-time sensor."""
+
+    def __init__(self, item, ikamand, config_entry):
+        """Initialize the device."""
+        super().__init__(ikamand, config_entry)
+        self._fields = {"online", f"probe_{item}", f"probe_{item}_eta"}
+        self._ikamand = ikamand
+        self._name = item
+
+    @property
+    def device_class(self):
+        """Return the class of this sensor."""
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def icon(self):
+        """Return the icon for this sensor."""
+        return "mdi:timer-check-outline"
+
+    @property
+    def name(self):
+        """Return the name for this sensor."""
+        return 'Probe ' + str(self._name) + ' ETA'
+
+    @property
+    def native_value(self):
+        """Return the estimated time at which the probe reaches its target."""
+        eta = getattr(self._ikamand, f"probe_{self._name}_eta")
+        if eta is None:
+            return None
+        return dt_util.utc_from_timestamp(eta)
+
+    @property
+    def unique_id(self):
+        """Return the unique ID for this sensor."""
+        return f"{self._ikamand.mac_address}#probe_{self._name}_eta"
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        if getattr(self._ikamand, f"probe_{self._name}") == None:
+            return False
+        return self._ikamand.online
+
+
+class iKamandLastCommandSensor(iKamandDevice, SensorEntity):
+    """Represents the iKamand last command diagnostic sensor."""
+
+    def __init__(self, ikamand, config_entry):
+        """Initialize the device."""
+        super().__init__(ikamand, config_entry)
+        self._fields = {"last_command"}
+        self._ikamand = ikamand
+
+    @property
+    def entity_category(self):
+        """Return the category of this sensor."""
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the sensor."""
+        if self._ikamand.last_command is None:
+            return None
+        latency = self._ikamand.last_command["latency"]
+        return {
+            "attempts": self._ikamand.last_command["attempts"],
+            "confirmation_latency": round(latency, 3) if latency is not None else None,
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for this sensor."""
+        return "mdi:send-check"
+
+    @property
+    def name(self):
+        """Return the name for this sensor."""
+        return "Last Command"
+
+    @property
+    def state(self):
+        """Return the state for this sensor."""
+        if self._ikamand.last_command is None:
+            return None
+        return self._ikamand.last_command["status"]
+
+    @property
+    def unique_id(self):
+        """Return the unique ID for this sensor."""
+        return f"{self._ikamand.mac_address}#last_command"
+
+
+class iKamandPollIntervalSensor(iKamandDevice, SensorEntity):
+    """Represents the iKamand poll interval diagnostic sensor."""
+
+    def __init__(self, ikamand, config_entry):
+        """Initialize the device."""
+        super().__init__(ikamand, config_entry)
+        self._fields = {"poll_interval"}
+        self._ikamand = ikamand
+
+    @property
+    def entity_category(self):
+        """Return the category of this sensor."""
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def icon(self):
+        """Return the icon for this sensor."""
+        return "mdi:timer-sync-outline"
+
+    @property
+    def name(self):
+        """Return the name for this sensor."""
+        return "Poll Interval"
+
+    @property
+    def state(self):
+        """Return the state for this sensor."""
+        return round(self._ikamand.poll_interval, 1)
+
+    @property
+    def unique_id(self):
+        """Return the unique ID for this sensor."""
+        return f"{self._ikamand.mac_address}#poll_interval"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement the value is expressed in."""
+        return UnitOfTime.SECONDS
+
+
+class iKamandPollLatencySensor(iKamandDevice, SensorEntity):
+    """Represents the iKamand poll latency diagnostic sensor."""
+
+    def __init__(self, ikamand, config_entry):
+        """Initialize the device."""
+        super().__init__(ikamand, config_entry)
+        self._fields = {"metrics"}
+        self._ikamand = ikamand
+
+    @property
+    def entity_category(self):
+        """Return the category of this sensor."""
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self):
+        """Return False, as this sensor is only useful when troubleshooting."""
+        return False
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the sensor."""
+        metrics = self._ikamand.metrics
+        return {
+            "P95": _milliseconds(metrics.poll_latency.quantile(0.95)),
+            "Max": _milliseconds(metrics.poll_latency.max),
+            "Queue Wait P95": _milliseconds(metrics.queue_wait.quantile(0.95)),
+            "Parse Time Mean": _milliseconds(metrics.parse_time.mean),
+            "Command Latency P95": _milliseconds(metrics.command_latency.quantile(0.95)),
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for this sensor."""
+        return "mdi:timer-outline"
+
+    @property
+    def name(self):
+        """Return the name for this sensor."""
+        return "Poll Latency"
+
+    @property
+    def state(self):
+        """Return the median poll latency."""
+        return _milliseconds(self._ikamand.metrics.poll_latency.quantile(0.5))
+
+    @property
+    def unique_id(self):
+        """Return the unique ID for this sensor."""
+        return f"{self._ikamand.mac_address}#poll_latency"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement the value is expressed in."""
+        return UnitOfTime.MILLISECONDS
+
+
+class iKamandPollErrorsSensor(iKamandDevice, SensorEntity):
+    """Represents the iKamand request errors diagnostic sensor."""
+
+    def __init__(self, ikamand, config_entry):
+        """Initialize the device."""
+        super().__init__(ikamand, config_entry)
+        self._fields = {"metrics"}
+        self._ikamand = ikamand
+
+    @property
+    def entity_category(self):
+        """Return the category of this sensor."""
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self):
+        """Return False, as this sensor is only useful when troubleshooting."""
+        return False
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the sensor."""
+        metrics = self._ikamand.metrics
+        return {
+            "Timeouts": metrics.timeouts,
+            "Connection Errors": metrics.connection_errors,
+            "Bad Status": metrics.bad_status,
+            "Parse Errors": metrics.parse_errors,
+            "Short Circuited": metrics.short_circuited,
+            "Recoveries": metrics.recoveries,
+            "Went Online": metrics.went_online,
+            "Went Offline": metrics.went_offline,
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for this sensor."""
+        return "mdi:lan-disconnect"
+
+    @property
+    def name(self):
+        """Return the name for this sensor."""
+        return "Request Errors"
+
+    @property
+    def state(self):
+        """Return the number of failed requests."""
+        return self._ikamand.metrics.errors
+
+    @property
+    def unique_id(self):
+        """Return the unique ID for this sensor."""
+        return f"{self._ikamand.mac_address}#request_errors"
+
+
+def _milliseconds(seconds):
+    """Convert a duration in seconds to rounded milliseconds."""
+    if seconds is None:
+        return None
+    return round(seconds * 1000, 1)
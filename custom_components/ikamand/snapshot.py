@@ -0,0 +1,113 @@
+"""iKamand telemetry snapshot."""
+
+from .const import (
+    COOK_START,
+    FALSE_TEMPS,
+    FAN_SPEED,
+    FOOD_PROBE,
+    PIT_TEMP,
+    PROBE_1,
+    PROBE_2,
+    PROBE_3,
+    TARGET_FOOD_TEMP,
+    TARGET_PIT_TEMP,
+    UPTIME,
+)
+
+DATA_KEYS = frozenset((COOK_START, FAN_SPEED, FOOD_PROBE, PIT_TEMP, PROBE_1, PROBE_2, PROBE_3, TARGET_FOOD_TEMP, TARGET_PIT_TEMP, UPTIME))
+
+
+class IkamandSnapshot:
+    """An immutable, decoded cgi-bin/data response."""
+
+    __slots__ = (
+        "cooking",
+        "fan_speed",
+        "food_probe",
+        "pit_temp",
+        "probe_1",
+        "probe_2",
+        "probe_3",
+        "target_food_temp",
+        "target_pit_temp",
+        "uptime",
+    )
+
+    def __init__(self, cooking=False, fan_speed=0, food_probe=0, pit_temp=None, probe_1=None, probe_2=None, probe_3=None, target_food_temp=0, target_pit_temp=0, uptime=0):
+        """Initialize the snapshot."""
+        init = object.__setattr__
+        init(self, "cooking", cooking)
+        init(self, "fan_speed", fan_speed)
+        init(self, "food_probe", food_probe)
+        init(self, "pit_temp", pit_temp)
+        init(self, "probe_1", probe_1)
+        init(self, "probe_2", probe_2)
+        init(self, "probe_3", probe_3)
+        init(self, "target_food_temp", target_food_temp)
+        init(self, "target_pit_temp", target_pit_temp)
+        init(self, "uptime", uptime)
+
+    def __setattr__(self, name, value):
+        """Refuse to modify the snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        """Refuse to modify the snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        """Return True if both snapshots hold the same values."""
+        if not isinstance(other, IkamandSnapshot):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __hash__(self):
+        """Return a hash of the snapshot values."""
+        return hash(tuple(getattr(self, field) for field in self.__slots__))
+
+    def replace(self, **changes):
+        """Return a copy of the snapshot with some fields changed."""
+        return IkamandSnapshot(**{field: changes.get(field, getattr(self, field)) for field in self.__slots__})
+
+    def changed_fields(self, other):
+        """Return the names of the fields that differ from another snapshot."""
+        return frozenset(field for field in self.__slots__ if getattr(self, field) != getattr(other, field))
+
+    def __repr__(self):
+        """Return a readable representation of the snapshot."""
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+EMPTY_SNAPSHOT = IkamandSnapshot()
+
+
+def _temperature(value):
+    """Decode a temperature, None when no probe is plugged in."""
+    if value is None or value in FALSE_TEMPS:
+        return None
+    return int(value)
+
+
+def parse_snapshot(text):
+    """Decode a cgi-bin/data response body, raise ValueError on a malformed value."""
+    values = {}
+
+    for field in text.strip().split("&"):
+        key, _, value = field.partition("=")
+        if key in DATA_KEYS and value and key not in values:
+            values[key] = value
+
+    get = values.get
+    return IkamandSnapshot(
+        cooking=get(COOK_START) == "1",
+        fan_speed=int(get(FAN_SPEED, 0)),
+        food_probe=int(get(FOOD_PROBE, 0)),
+        pit_temp=_temperature(get(PIT_TEMP)),
+        probe_1=_temperature(get(PROBE_1)),
+        probe_2=_temperature(get(PROBE_2)),
+        probe_3=_temperature(get(PROBE_3)),
+        target_food_temp=int(get(TARGET_FOOD_TEMP, 0)),
+        target_pit_temp=int(get(TARGET_PIT_TEMP, 0)),
+        uptime=int(get(UPTIME, 0)),
+    )
@@ -0,0 +1,94 @@
+"""iKamand pit-control statistics."""
+import math
+
+from .const import PIT_BAND, PIT_MAX_GAP
+
+
+class PitStatistics:
+    """Streaming pit-control quality metrics for the current cook, updated in O(1) per sample."""
+
+    def __init__(self):
+        """Initialize the statistics."""
+        self.reset()
+
+    def reset(self):
+        """Forget every sample, as when a new cook starts."""
+        self._cooking = False
+        self._count = 0
+        self._fan_mean = 0.0
+        self._in_band_time = 0.0
+        self._last_timestamp = None
+        self._m2 = 0.0
+        self._mean = 0.0
+        self._overshoot = 0
+        self._target = None
+        self._total_time = 0.0
+
+    def add(self, timestamp, data):
+        """Add a snapshot, starting over when a cook starts; samples without a cook or a pit reading are skipped."""
+        if data.cooking and not self._cooking:
+            self.reset()
+
+        self._cooking = data.cooking
+
+        if not data.cooking or data.pit_temp is None:
+            self._last_timestamp = None
+            return
+
+        error = data.pit_temp - data.target_pit_temp
+
+        if data.target_pit_temp != self._target:
+            self._target = data.target_pit_temp
+            self._overshoot = 0
+
+        self._overshoot = max(self._overshoot, error)
+
+        self._count += 1
+        delta = error - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (error - self._mean)
+        self._fan_mean += (data.fan_speed - self._fan_mean) / self._count
+
+        if self._last_timestamp is not None:
+            elapsed = min(timestamp - self._last_timestamp, PIT_MAX_GAP)
+            self._total_time += elapsed
+            if abs(error) <= PIT_BAND:
+                self._in_band_time += elapsed
+
+        self._last_timestamp = timestamp
+
+    @property
+    def count(self):
+        """Return the number of samples."""
+        return self._count
+
+    @property
+    def fan_duty_average(self):
+        """Return the average fan duty in %."""
+        return self._fan_mean if self._count else None
+
+    @property
+    def mean_error(self):
+        """Return the average of pit temperature minus target."""
+        return self._mean if self._count else None
+
+    @property
+    def overshoot(self):
+        """Return the highest pit temperature above target since the last setpoint change."""
+        return self._overshoot if self._count else None
+
+    @property
+    def rounded(self):
+        """Return the statistics rounded to 0.1, which only change when their shown values do."""
+        values = (self.mean_error, self.std_dev, self.overshoot, self.time_in_band, self.fan_duty_average)
+        return tuple(None if value is None else round(value, 1) for value in values)
+
+    @property
+    def std_dev(self):
+        """Return the standard deviation of the error."""
+        return math.sqrt(self._m2 / (self._count - 1)) if self._count > 1 else None
+
+    @property
+    def time_in_band(self):
+        """Return the share of cook time in %, spent within PIT_BAND of target."""
+        return self._in_band_time / self._total_time * 100 if self._total_time else None
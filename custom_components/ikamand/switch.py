@@ -1,11 +1,8 @@
 """iKamand switches."""
 from . import iKamandDevice
 from .const import _LOGGER, API, DOMAIN
-from datetime import timedelta
 from homeassistant.components.switch import SwitchEntity
 
-SCAN_INTERVAL = timedelta(seconds=5)
-
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Setup the iKamand switches."""
@@ -24,6 +21,7 @@ class FireItUp(iKamandDevice, SwitchEntity):
     def __init__(self, ikamand, config_entry):
         """Initialise the device."""
         super().__init__(ikamand, config_entry)
+        self._fields = {"online", "starting"}
         self._ikamand = ikamand
 
     @property
@@ -0,0 +1,66 @@
+"""Benchmark of LAN discovery against a simulated /24 subnet.
+
+Each of the 254 hosts is a localhost port: a few simulated iKamand, some
+HTTP servers that are not iKamand, some hosts that accept connections but
+never answer, and closed ports for the rest. Run from the repository root:
+
+    python -m tools.bench_discovery [--ikamand 3] [--other 10] [--silent 20]
+"""
+import aiohttp
+import argparse
+import asyncio
+import time
+
+from custom_components.ikamand.discovery import async_discover
+from tools.simulator import SimulatedDevice, start_fleet
+
+HOSTS = 254
+
+
+async def closed_hosts(count):
+    """Return count localhost host:port addresses with nothing listening."""
+    devices = await start_fleet(count)
+    hosts = [device.host for device in devices]
+
+    for device in devices:
+        await device.stop()
+
+    return hosts
+
+
+async def main(ikamand, other, silent):
+    """Scan a simulated subnet and check that exactly the iKamand are found."""
+    fleet = await start_fleet(ikamand)
+    others = [SimulatedDevice() for _ in range(other + silent)]
+
+    for i, device in enumerate(others):
+        await device.start()
+        if i < other:
+            device.error_status = 404
+        else:
+            device.hang = True
+
+    hosts = [device.host for device in fleet + others]
+    hosts += await closed_hosts(HOSTS - len(hosts))
+
+    async with aiohttp.ClientSession() as session:
+        start = time.perf_counter()
+        found = await async_discover(session, hosts)
+        elapsed = time.perf_counter() - start
+
+    expected = {device.host: (device.mac, device.fw_version) for device in fleet}
+
+    for device in fleet + others:
+        await device.stop()
+
+    print(f"scanned {len(hosts)} hosts in {elapsed:.2f}s, found {len(found)} iKamand")
+    return found == expected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LAN discovery against a simulated subnet.")
+    parser.add_argument("--ikamand", type=int, default=3)
+    parser.add_argument("--other", type=int, default=10)
+    parser.add_argument("--silent", type=int, default=20)
+    args = parser.parse_args()
+    raise SystemExit(0 if asyncio.run(main(args.ikamand, args.other, args.silent)) else 1)
@@ -0,0 +1,83 @@
+"""Benchmark of the polling engine against a fleet of simulated iKamand devices.
+
+Run from the repository root:
+
+    python -m tools.bench_fleet [--devices 1 5 10 25 50] [--duration 10] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from custom_components.ikamand.engine import IkamandPollingEngine
+from custom_components.ikamand.ikamand import Ikamand
+from tools.simulator import start_fleet
+
+LATENCY = 0.05
+POLL_INTERVAL = 1
+
+
+class TimedIkamand(Ikamand):
+    """An Ikamand recording the latency of each poll."""
+
+    def __init__(self, host_ip):
+        """Initialize the client."""
+        super().__init__(host_ip)
+        self.latencies = []
+
+    async def async_update(self):
+        """Poll once and record how long it took."""
+        start = time.perf_counter()
+        await super().async_update()
+        self.latencies.append(time.perf_counter() - start)
+
+    @property
+    def poll_interval(self):
+        """Poll at a fixed rate so every fleet size does the same work per device."""
+        return POLL_INTERVAL
+
+
+async def run_fleet(devices, duration, latency=LATENCY):
+    """Poll a fleet for the given duration and return its latency statistics in milliseconds."""
+    engine = IkamandPollingEngine()
+    fleet = await start_fleet(devices)
+    clients = [TimedIkamand(device.host) for device in fleet]
+
+    for i, (device, ikamand) in enumerate(zip(fleet, clients)):
+        device.latency = latency
+        device.apply_cook(f"ct={int(time.time())}")
+        ikamand._online = True
+        engine.add(i, ikamand)
+
+    await asyncio.sleep(duration)
+
+    for i, (device, ikamand) in enumerate(zip(fleet, clients)):
+        await engine.remove(i)
+        await ikamand.close()
+        await device.stop()
+
+    latencies = sorted(sample * 1000 for ikamand in clients for sample in ikamand.latencies)
+    return {
+        "devices": devices,
+        "polls": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+        "max_ms": latencies[-1],
+    }
+
+
+async def main(sizes, duration, latency):
+    """Run the benchmark for every fleet size."""
+    print(f"{'devices':>8}{'polls':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for devices in sizes:
+        result = await run_fleet(devices, duration, latency)
+        print(f"{result['devices']:>8}{result['polls']:>8}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['max_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the polling engine against simulated fleets.")
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--latency", type=float, default=LATENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.devices, args.duration, args.latency))
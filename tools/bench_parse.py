@@ -0,0 +1,89 @@
+"""Micro-benchmark of the cgi-bin/data parse and property access paths.
+
+Run from the repository root:
+
+    python -m tools.bench_parse
+"""
+import timeit
+
+from custom_components.ikamand.const import (
+    COOK_START,
+    FALSE_TEMPS,
+    FAN_SPEED,
+    PIT_TEMP,
+    PROBE_1,
+    PROBE_2,
+    PROBE_3,
+    TARGET_PIT_TEMP,
+)
+from custom_components.ikamand.snapshot import parse_snapshot
+from urllib.parse import parse_qs
+
+BODY = (
+    "time=1729260000&acs=1&csid=&pt=121&t1=64&t2=400&t3=-400&dc=35"
+    "&tpt=125&sce=1729346400&p=1&tft=95&rm=0&cm=0&ag=0"
+)
+NUMBER = 100_000
+
+
+def legacy_temperature(data, key):
+    """Temperature lookup as done by the former Ikamand properties."""
+    return (
+        int(data.get(key, ["400"])[0])
+        if data.get(key, ["400"])[0] not in FALSE_TEMPS
+        else None
+    )
+
+
+def legacy_parse():
+    """Parse with parse_qs, as the client did before snapshots."""
+    return parse_qs(BODY)
+
+
+def legacy_read(data):
+    """Read every field once through the dict-of-lists lookups."""
+    return (
+        data.get(COOK_START, [0])[0] == "1",
+        int(data.get(FAN_SPEED, ["0"])[0]),
+        legacy_temperature(data, PIT_TEMP),
+        legacy_temperature(data, PROBE_1),
+        legacy_temperature(data, PROBE_2),
+        legacy_temperature(data, PROBE_3),
+        int(data.get(TARGET_PIT_TEMP, [0])[0]),
+    )
+
+
+def snapshot_read(snapshot):
+    """Read every field once from a snapshot."""
+    return (
+        snapshot.cooking,
+        snapshot.fan_speed,
+        snapshot.pit_temp,
+        snapshot.probe_1,
+        snapshot.probe_2,
+        snapshot.probe_3,
+        snapshot.target_pit_temp,
+    )
+
+
+def run(number=NUMBER):
+    """Return the mean cost in microseconds of each path."""
+    legacy = legacy_parse()
+    snapshot = parse_snapshot(BODY)
+    assert legacy_read(legacy) == snapshot_read(snapshot)
+
+    cases = {
+        "parse_qs": legacy_parse,
+        "parse_snapshot": lambda: parse_snapshot(BODY),
+        "read_legacy": lambda: legacy_read(legacy),
+        "read_snapshot": lambda: snapshot_read(snapshot),
+    }
+    return {name: min(timeit.repeat(case, number=number, repeat=5)) / number * 1e6 for name, case in cases.items()}
+
+
+if __name__ == "__main__":
+    results = run()
+    for name, usec in results.items():
+        print(f"{name:<16}{usec:8.3f} us")
+    print(f"parse speedup   {results['parse_qs'] / results['parse_snapshot']:8.2f}x")
+    print(f"read speedup    {results['read_legacy'] / results['read_snapshot']:8.2f}x")
@@ -0,0 +1,212 @@
+"""Offline benchmark suite for the iKamand client.
+
+Every case runs against simulated devices on localhost, so no grill is
+needed. Results are written as JSON and can be compared with a previous
+run to spot regressions:
+
+    python -m tools.benchmark --output before.json
+    python -m tools.benchmark --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+import timeit
+
+from custom_components.ikamand.ikamand import Ikamand
+from tools import bench_parse
+from tools.simulator import start_fleet
+
+PROPERTIES = (
+    "cooking",
+    "fan_speed",
+    "firmware_version",
+    "mac_address",
+    "online",
+    "pit_temp",
+    "poll_interval",
+    "probe_1",
+    "probe_2",
+    "probe_3",
+    "starting",
+    "target_pit_temp",
+)
+
+
+def summarize(samples):
+    """Return latency statistics in milliseconds for samples in seconds."""
+    samples = sorted(sample * 1000 for sample in samples)
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)],
+        "max_ms": samples[-1],
+    }
+
+
+async def connected_client(device):
+    """Return a client whose simulated device clock is set, as after a normal start."""
+    device.apply_cook(f"ct={int(time.time())}")
+    ikamand = Ikamand(device.host)
+    await ikamand.get_info()
+    await ikamand.async_update()
+    return ikamand
+
+
+async def bench_poll(device, iterations):
+    """Measure the end-to-end latency of one data poll."""
+    ikamand = await connected_client(device)
+    samples = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await ikamand.async_update()
+        samples.append(time.perf_counter() - start)
+
+    await ikamand.close()
+    return summarize(samples)
+
+
+async def bench_command(device, iterations):
+    """Measure the round trip of post_commands."""
+    ikamand = await connected_client(device)
+    samples = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await ikamand.start_ikamand(120)
+        samples.append(time.perf_counter() - start)
+
+    await ikamand.stop_ikamand()
+    await ikamand.close()
+    return summarize(samples)
+
+
+async def bench_properties(device, number):
+    """Measure the cost of reading every Ikamand property once."""
+    ikamand = await connected_client(device)
+    await ikamand.close()
+
+    def read_all():
+        for name in PROPERTIES:
+            getattr(ikamand, name)
+
+    usec = min(timeit.repeat(read_all, number=number, repeat=5)) / number * 1e6
+    return {"properties": len(PROPERTIES), "usec_per_read_all": usec, "usec_per_property": usec / len(PROPERTIES)}
+
+
+def bench_parse_throughput(number):
+    """Measure response body parse throughput."""
+    results = bench_parse.run(number)
+    return {name: {"usec": usec, "per_second": 1e6 / usec} for name, usec in results.items()}
+
+
+async def measure_loop_lag(duration, interval=0.01):
+    """Return how late, on average, a timer fires on the event loop, in milliseconds."""
+    lags = []
+    end = time.perf_counter() + duration
+
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+    return statistics.fmean(lags) * 1000
+
+
+async def bench_loop_lag(fleet, duration):
+    """Measure the event loop lag added per device polling continuously."""
+    baseline = await measure_loop_lag(duration)
+    clients = [await connected_client(device) for device in fleet]
+    running = True
+
+    async def poll_forever(ikamand):
+        while running:
+            await ikamand.async_update()
+
+    tasks = [asyncio.create_task(poll_forever(ikamand)) for ikamand in clients]
+    loaded = await measure_loop_lag(duration)
+    running = False
+    await asyncio.gather(*tasks)
+
+    for ikamand in clients:
+        await ikamand.close()
+
+    return {
+        "devices": len(fleet),
+        "baseline_lag_ms": baseline,
+        "loaded_lag_ms": loaded,
+        "lag_per_device_ms": (loaded - baseline) / len(fleet),
+    }
+
+
+async def run(iterations, devices, duration):
+    """Run every benchmark case and return the results."""
+    fleet = await start_fleet(devices)
+
+    try:
+        return {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": int(time.time()),
+            },
+            "poll": await bench_poll(fleet[0], iterations),
+            "command": await bench_command(fleet[0], iterations),
+            "properties": await bench_properties(fleet[0], iterations * 100),
+            "parse": bench_parse_throughput(iterations * 100),
+            "loop_lag": await bench_loop_lag(fleet, duration),
+        }
+    finally:
+        for device in fleet:
+            await device.stop()
+
+
+def flatten(results, prefix=""):
+    """Flatten nested results into dotted metric names."""
+    metrics = {}
+
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{prefix}{key}."))
+        else:
+            metrics[f"{prefix}{key}"] = value
+
+    return metrics
+
+
+def compare(results, baseline):
+    """Print every metric next to its baseline value."""
+    current = flatten(results)
+    previous = flatten(baseline)
+
+    for name, value in current.items():
+        if name in previous and previous[name]:
+            print(f"{name:<40}{previous[name]:>14.3f}{value:>14.3f}{value / previous[name]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the iKamand client against simulated devices.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations, args.devices, args.duration))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
+    elif not args.output:
+        print(json.dumps(results, indent=2))
@@ -0,0 +1,441 @@
+"""Accelerated replay of the iKamand client under a virtual clock.
+
+The client runs on an event loop whose clock jumps straight to the next
+scheduled timer, so poll intervals, command debouncing and confirmation
+timeouts cost no real time. Requests are answered in memory, either by a
+SimulatedDevice driven by the same virtual clock or by a recorded session
+log. Scenarios assert on the commands the client sends, so hours of
+recovery and control edge cases run in a fraction of a second.
+
+Run the built-in scenarios from the repository root:
+
+    python -m tools.replay
+
+or replay a recorded session and print the commands the client would send:
+
+    python -m tools.replay --session config/ikamand/aabbccddeeff.ikrec
+"""
+import aiohttp
+import argparse
+import asyncio
+import bisect
+import custom_components.ikamand as integration
+import logging
+import selectors
+import tempfile
+import threading
+import time
+
+from custom_components.ikamand.const import (
+    API,
+    CONF_FW_VERSION,
+    CONF_RECORD_SESSIONS,
+    COOK_START,
+    DOMAIN,
+    FOOD_PROBE,
+    GOOD_HTTP_CODES,
+    TARGET_FOOD_TEMP,
+    TARGET_PIT_TEMP,
+)
+from custom_components.ikamand.ikamand import REQUEST_TIMEOUT, Ikamand
+from custom_components.ikamand.recorder import SessionReader
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import SOURCE_USER, ConfigEntries, ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_MAC
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from tools.simulator import SimulatedDevice
+from urllib.parse import urlencode
+
+EPOCH = 1_700_000_000
+OFFLINE_GAP = 60
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """A selector that advances the virtual clock instead of sleeping."""
+
+    def __init__(self):
+        """Initialize the selector."""
+        super().__init__()
+        self.now = 0.0
+
+    def select(self, timeout=None):
+        """Return ready events without waiting, jumping the clock to the next timer when idle."""
+        events = super().select(0 if timeout is not None else None)
+
+        if not events and timeout:
+            self.now += timeout
+
+        return events
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """An event loop running on virtual time, for code that does no real I/O."""
+
+    def __init__(self):
+        """Initialize the loop."""
+        self._virtual = VirtualSelector()
+        super().__init__(self._virtual)
+
+    def time(self):
+        """Return the virtual time."""
+        return self._virtual.now
+
+
+class ReplayIkamand(Ikamand):
+    """An Ikamand whose requests are answered in memory by a device model."""
+
+    def __init__(self, device, clock):
+        """Initialize the client."""
+        super().__init__("replay", clock=clock)
+        self.device = device
+        self.sent = []
+
+    async def _send_request(self, method, endpoint, headers=None, data=None):
+        """Answer a request from the device model, honouring its failure modes."""
+        device = self.device
+
+        if data is not None:
+            self.sent.append((self._clock(), dict(data)))
+
+        if device.refuse:
+            raise aiohttp.ClientConnectionError("connection refused")
+
+        if device.hang:
+            await asyncio.sleep(REQUEST_TIMEOUT.sock_read)
+            raise asyncio.TimeoutError
+
+        if device.latency:
+            await asyncio.sleep(device.latency)
+
+        status, body = device.handle(method, f"/cgi-bin/{endpoint}", urlencode(data or {}))
+        return body if status in GOOD_HTTP_CODES else None
+
+
+async def start_home_assistant(config_dir):
+    """Start a Home Assistant core with its registries and config entries, loading this repository's integration."""
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    hass = HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+    # The network integration needs the HTTP server; the entry only uses it in its config flow.
+    hass.config.components.add("network")
+    assert await async_setup_component(hass, DOMAIN, {})
+    return hass
+
+
+class RecordedDevice:
+    """A device model answering data requests from a recorded session log, ignoring commands."""
+
+    def __init__(self, path, clock, mac="AA:BB:CC:DD:EE:FF", fw_version="recorded"):
+        """Load the data samples of a session log."""
+        with SessionReader(path) as reader:
+            samples = list(reader.samples())
+
+        self.clock = clock
+        self.fw_version = fw_version
+        self.mac = mac
+        self.hang = False
+        self.latency = 0.0
+        self.timestamps = [timestamp for timestamp, _ in samples]
+        self.values = [values for _, values in samples]
+
+    @property
+    def refuse(self):
+        """Refuse requests outside the recording or inside gaps longer than OFFLINE_GAP."""
+        now = self.clock()
+        index = bisect.bisect_right(self.timestamps, now)
+
+        if index == 0:
+            return True
+        if index == len(self.timestamps):
+            return now - self.timestamps[-1] > OFFLINE_GAP
+        return self.timestamps[index] - self.timestamps[index - 1] > OFFLINE_GAP
+
+    def handle(self, method, path, body):
+        """Return the status and body answering a request."""
+        if path.endswith("info"):
+            return 200, f"MAC={self.mac}&fw_version={self.fw_version}"
+        if path.endswith("cook"):
+            return 200, ""
+
+        values = self.values[bisect.bisect_right(self.timestamps, self.clock()) - 1]
+        return 200, "&".join(f"{key}={value}" for key, value in values.items())
+
+
+def run(scenario, start=EPOCH, **device_options):
+    """Run a scenario coroutine function on virtual time, return its result and virtual duration."""
+    loop = VirtualTimeLoop()
+
+    def clock():
+        return start + loop.time()
+
+    async def main():
+        device = SimulatedDevice(clock=clock, **device_options)
+        ikamand = ReplayIkamand(device, clock)
+        await ikamand.get_info()
+        poller = asyncio.create_task(ikamand.get_data())
+
+        try:
+            return await scenario(device, ikamand)
+        finally:
+            poller.cancel()
+            await asyncio.gather(poller, return_exceptions=True)
+            await ikamand.close()
+
+    try:
+        result = loop.run_until_complete(main())
+        return result, loop.time()
+    finally:
+        loop.close()
+
+
+async def sleep_until(ikamand, moment):
+    """Sleep until the client clock reaches a moment."""
+    await asyncio.sleep(moment - ikamand._clock())
+
+
+async def start_cook(device, ikamand, target=120):
+    """Bring the device online with its clock set and a cook running at target."""
+    await asyncio.sleep(90)
+    await ikamand.start_ikamand(target)
+    await asyncio.sleep(600)
+    assert ikamand.online and ikamand.cooking and ikamand.target_pit_temp == target
+    ikamand.sent.clear()
+
+
+async def scenario_resume_after_quick_reboot(device, ikamand):
+    """A reboot in the middle of a cook resumes the cook at the same target."""
+    await start_cook(device, ikamand)
+    device.reboot()
+    reboot = ikamand._clock()
+    await asyncio.sleep(120)
+    assert ikamand.sent, "no recovery command sent"
+    moment, payload = ikamand.sent[0]
+    assert payload[COOK_START] == 1 and payload[TARGET_PIT_TEMP] == 120, payload
+    assert moment - reboot < 50, f"resumed {moment - reboot:.0f}s after the reboot"
+    assert ikamand.online and ikamand.cooking
+    return f"resumed {moment - reboot:.0f}s after the reboot"
+
+
+async def scenario_stop_after_long_outage(device, ikamand):
+    """A reboot after more than 600s offline stops the cook instead of resuming it."""
+    await start_cook(device, ikamand)
+    device.refuse = True
+    await asyncio.sleep(900)
+    assert not ikamand.online
+    device.refuse = False
+    device.reboot()
+    await asyncio.sleep(600)
+    assert ikamand.sent, "no recovery command sent"
+    assert all(payload[COOK_START] == 0 for _, payload in ikamand.sent), ikamand.sent
+    assert not ikamand.cooking
+
+
+async def scenario_resync_clock_skew(device, ikamand):
+    """A device clock drifting more than 60s is resynchronised once, keeping the cook."""
+    await start_cook(device, ikamand)
+    device.clock_skew = 90
+    await asyncio.sleep(600)
+    assert len(ikamand.sent) == 1, ikamand.sent
+    payload = ikamand.sent[0][1]
+    assert payload[COOK_START] == 1 and payload[TARGET_PIT_TEMP] == 120, payload
+
+
+async def scenario_fire_it_up_ends_on_time(device, ikamand):
+    """Fire It Up stops the fan within a second of the end of the selected duration, even with slow polls."""
+    await asyncio.sleep(90)
+    ikamand.sent.clear()
+    ikamand._set_fan_duration = 10
+    await ikamand.fire_it_up()
+    end = ikamand._starting_end_time
+    await sleep_until(ikamand, end - 30)
+    device.latency = 1.4
+    await sleep_until(ikamand, end + 30)
+    stops = [moment for moment, payload in ikamand.sent if payload[COOK_START] == 0]
+    assert stops, "fan never stopped"
+    lateness = stops[0] - end
+    assert 0 <= lateness < 1, f"stopped {lateness:.1f}s late"
+    assert not ikamand.starting
+    return f"stopped {lateness:.2f}s after the deadline"
+
+
+async def scenario_long_cook_is_quiet(device, ikamand):
+    """A steady 12-hour cook sends no command besides the start."""
+    await start_cook(device, ikamand)
+    await asyncio.sleep(12 * 3600)
+    assert not ikamand.sent, ikamand.sent
+    assert ikamand.online and ikamand.cooking
+    return f"{device.requests['data']} polls"
+
+
+async def scenario_reload_keeps_one_poller(device, ikamand):
+    """Reloading a config entry in Home Assistant over and over keeps one poller, a constant request rate and its runtime state."""
+    await start_cook(device, ikamand)
+    rates = []
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await start_home_assistant(config_dir)
+        integration.Ikamand = lambda host, session: ReplayIkamand(device, ikamand._clock)
+
+        try:
+            entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title="iKamand",
+                data={CONF_HOST: "replay", CONF_MAC: device.mac, CONF_FW_VERSION: device.fw_version},
+                source=SOURCE_USER,
+                options={CONF_RECORD_SESSIONS: True},
+            )
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+            tasks = len(asyncio.all_tasks())
+
+            for reload in range(50):
+                client = hass.data[DOMAIN][entry.entry_id][API]
+                assert client.probe_1_target_temperature == reload, client.probe_1_target_temperature
+                client.set_probe_target_temperature(1, reload + 1)
+                polls = device.requests["data"]
+                await asyncio.sleep(300)
+                rates.append(device.requests["data"] - polls)
+                assert await hass.config_entries.async_reload(entry.entry_id)
+                await hass.async_block_till_done()
+                assert len(asyncio.all_tasks()) == tasks, asyncio.all_tasks()
+                writers = [thread for thread in threading.enumerate() if thread.name.startswith("ikamand recorder")]
+                assert len(writers) == 1, writers
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            assert not hass.data[DOMAIN], hass.data[DOMAIN]
+        finally:
+            integration.Ikamand = Ikamand
+            await hass.async_stop()
+
+        with SessionReader(hass.config.path(DOMAIN, f"{device.mac.replace(':', '').lower()}.ikrec")) as reader:
+            samples = sum(1 for _ in reader.samples())
+
+    assert max(rates) - min(rates) <= 2, rates
+    return f"{min(rates)}-{max(rates)} polls per 300s over {len(rates)} reloads, {samples} samples recorded"
+
+
+async def scenario_merged_setpoints_roll_forward(device, ikamand):
+    """Quick setpoint changes merged into one request leave only the last one shown, then follow the device."""
+    await start_cook(device, ikamand)
+    await asyncio.gather(ikamand.start_ikamand(125), ikamand.start_ikamand(130), ikamand.start_ikamand(135))
+    await asyncio.sleep(30)
+    assert not ikamand._optimistic, ikamand._optimistic
+    assert ikamand.target_pit_temp == 135, ikamand.target_pit_temp
+    assert ikamand.last_command["status"] == "confirmed", ikamand.last_command
+    device.cook[TARGET_PIT_TEMP] = 150
+    await asyncio.sleep(30)
+    assert ikamand.target_pit_temp == 150, ikamand.target_pit_temp
+    return f"{len(ikamand.sent)} requests for 3 setpoints"
+
+
+async def scenario_program_ramps_then_waits_probe(device, ikamand):
+    """A cook program ramps the pit target by degrees, waits for the probe, then stops the cook."""
+    await start_cook(device, ikamand, target=110)
+    ikamand.start_program([
+        {"type": "ramp", "temperature": 135, "duration": 7200},
+        {"type": "wait_probe", "probe": 1, "temperature": 80},
+        {"type": "stop"},
+    ])
+    await asyncio.sleep(7200 + 60)
+    targets = [payload[TARGET_PIT_TEMP] for _, payload in ikamand.sent if payload[COOK_START] == 1]
+    assert targets and targets[-1] == 135, targets
+    assert targets == sorted(targets) and len(targets) <= 26, targets
+    assert ikamand.program is not None and ikamand.program.index == 1, ikamand.program
+    ramp_end = ikamand._clock()
+    await asyncio.sleep(12 * 3600)
+    stops = [moment for moment, payload in ikamand.sent if payload[COOK_START] == 0]
+    assert len(stops) == 1 and ikamand.program is None and not ikamand.cooking, ikamand.sent[len(targets):]
+    return f"{len(targets)} ramp commands, stopped {(stops[0] - ramp_end) / 60:.0f} min after the ramp"
+
+
+async def scenario_program_keeps_food_probe(device, ikamand):
+    """Pit changes of a cook program keep the food probe it set, which waits for a running cook."""
+    await asyncio.sleep(90)
+    ikamand.sent.clear()
+    ikamand.start_program([{"type": "start_cooking", "probe": 1, "temperature": 90}])
+    await asyncio.sleep(60)
+    assert not ikamand.sent and ikamand.program.index == 0, ikamand.sent
+    await ikamand.start_ikamand(110)
+    await asyncio.sleep(60)
+    assert ikamand.program is None and device.cook[FOOD_PROBE] == 1, device.cook
+    ikamand.start_program([
+        {"type": "set_pit", "temperature": 115},
+        {"type": "start_cooking", "probe": 2, "temperature": 85},
+        {"type": "ramp", "temperature": 125, "duration": 600},
+    ])
+    await asyncio.sleep(700)
+    assert device.cook[TARGET_PIT_TEMP] == 125, device.cook
+    assert device.cook[FOOD_PROBE] == 2 and device.cook[TARGET_FOOD_TEMP] == 85, device.cook
+    return f"{len(ikamand.sent)} commands"
+
+
+SCENARIOS = [
+    scenario_resume_after_quick_reboot,
+    scenario_stop_after_long_outage,
+    scenario_resync_clock_skew,
+    scenario_fire_it_up_ends_on_time,
+    scenario_long_cook_is_quiet,
+    scenario_reload_keeps_one_poller,
+    scenario_merged_setpoints_roll_forward,
+    scenario_program_ramps_then_waits_probe,
+    scenario_program_keeps_food_probe,
+]
+
+
+def run_scenarios():
+    """Run every scenario and print its outcome, return True if all passed."""
+    passed = True
+
+    for scenario in SCENARIOS:
+        wall = time.perf_counter()
+
+        try:
+            detail, duration = run(scenario)
+            outcome = "PASS"
+        except AssertionError as err:
+            detail, duration, outcome = str(err), 0, "FAIL"
+            passed = False
+
+        wall = time.perf_counter() - wall
+        speed = f"{duration / wall:>9.0f}x" if duration else " " * 10
+        print(f"{outcome} {scenario.__name__[9:]:<32}{duration:>8.0f}s virtual {wall:>7.3f}s wall {speed} {detail or ''}")
+
+    return passed
+
+
+def replay_session(path):
+    """Replay a recorded session and print the commands the client sends."""
+    with SessionReader(path) as reader:
+        first = next(reader.samples(), None)
+
+    if first is None:
+        print("no samples in session")
+        return
+
+    async def scenario(device, ikamand):
+        ikamand.device = RecordedDevice(path, ikamand._clock)
+        await sleep_until(ikamand, ikamand.device.timestamps[-1] + OFFLINE_GAP)
+        return ikamand.sent
+
+    sent, duration = run(scenario, start=first[0])
+
+    for moment, payload in sent:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(moment))} {payload}")
+    print(f"{len(sent)} commands over {duration:.0f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the iKamand client under a virtual clock.")
+    parser.add_argument("--session", help="replay this recorded session log instead of the built-in scenarios")
+    args = parser.parse_args()
+
+    if args.session:
+        replay_session(args.session)
+    else:
+        raise SystemExit(0 if run_scenarios() else 1)
@@ -0,0 +1,286 @@
+"""Local stand-in for the iKamand HTTP API, for tests and benchmarks.
+
+Each SimulatedDevice serves cgi-bin/info, cgi-bin/data and cgi-bin/cook on
+its own localhost port, with the same query-string wire format as the real
+controller. Pit and probe temperatures follow a simple thermal model driven
+by the target pit temperature and the fan duty. Latency, timeouts, refused
+requests, reboots and clock skew can be switched on at runtime, and any
+number of devices can run in one event loop.
+
+Run from the repository root to serve a few devices:
+
+    python -m tools.simulator --count 3
+"""
+import argparse
+import asyncio
+import time
+
+from custom_components.ikamand.const import (
+    COOK_END_TIME,
+    COOK_ID,
+    COOK_START,
+    CURRENT_TIME,
+    ENV,
+    FAN_SPEED,
+    FOOD_PROBE,
+    FW_VERSION,
+    MAC_ADDRESS,
+    PIT_TEMP,
+    PROBE_1,
+    PROBE_2,
+    PROBE_3,
+    TARGET_FOOD_TEMP,
+    TARGET_PIT_TEMP,
+    UNKNOWN_RECEIVE_VAR1,
+    UNKNOWN_RECEIVE_VAR2,
+    UNKNOWN_RECEIVE_VAR3,
+    UPTIME,
+)
+from urllib.parse import parse_qsl
+
+AMBIENT = 20.0
+FAN_GAIN = 0.05
+FAN_INTEGRAL_GAIN = 0.0005
+HEAT_GAIN = 1.0
+HEAT_LOSS = 0.004
+PROBE_GAIN = 0.0001
+STALL_FACTOR = 0.2
+STALL_RANGE = (65.0, 75.0)
+UNPLUGGED = "400"
+
+REASONS = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class SimulatedDevice:
+    """A simulated iKamand controller served over HTTP."""
+
+    def __init__(self, mac="AA:BB:CC:DD:EE:01", fw_version="2.1.0", probes=(True, False, False), clock=time.time):
+        """Initialize the device, powered on with its clock not yet set."""
+        self.mac = mac
+        self.fw_version = fw_version
+        self.clock = clock
+        self.clock_skew = 0
+        self.error_status = None
+        self.hang = False
+        self.latency = 0.0
+        self.refuse = False
+        self.commands = []
+        self.requests = {"info": 0, "data": 0, "cook": 0}
+        self._probes = list(probes)
+        self._server = None
+        self._connections = {}
+        self.reboot()
+
+    @property
+    def host(self):
+        """Return the host:port the device listens on."""
+        return f"127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+
+    async def start(self):
+        """Start serving on a free localhost port."""
+        self._server = await asyncio.start_server(self._handle_connection, "127.0.0.1", 0)
+
+    async def stop(self):
+        """Stop serving, then cancel the connection handlers and wait for them to finish."""
+        self._server.close()
+        handlers = list(self._connections.values())
+
+        for handler in handlers:
+            handler.cancel()
+
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def reboot(self):
+        """Power cycle the device: stop the cook and reset the clock to its uptime."""
+        self._boot_time = self.clock()
+        self._clock_offset = None
+        self._updated = self._boot_time
+        self.cook = {COOK_START: 0, COOK_ID: "", TARGET_PIT_TEMP: 0, COOK_END_TIME: 0, FOOD_PROBE: 0, TARGET_FOOD_TEMP: 0}
+        self.fan_speed = 0
+        self._integral = 0.0
+        self.pit_temp = AMBIENT
+        self.probe_temps = [AMBIENT, AMBIENT, AMBIENT]
+
+    def plug_probe(self, probe, plugged=True):
+        """Plug or unplug a food probe (1 to 3)."""
+        self._probes[probe - 1] = plugged
+
+    @property
+    def device_time(self):
+        """Return the time reported by the device, its uptime until a cook command sets the clock."""
+        now = self.clock()
+
+        if self._clock_offset is None:
+            return int(now - self._boot_time)
+        return int(now + self._clock_offset + self.clock_skew)
+
+    def advance(self):
+        """Integrate the thermal model up to the current clock, in one second steps."""
+        now = self.clock()
+
+        while self._updated < now:
+            step = min(1.0, now - self._updated)
+            self._updated += step
+            self._step(step)
+
+    def _step(self, step):
+        """Advance the thermal model by step seconds."""
+        if self._clock_offset is not None and self.cook[COOK_START] and self.cook[COOK_END_TIME]:
+            if self._updated + self._clock_offset + self.clock_skew >= self.cook[COOK_END_TIME]:
+                self.cook[COOK_START] = 0
+
+        if self.cook[COOK_START]:
+            error = self.cook[TARGET_PIT_TEMP] - self.pit_temp
+            duty = (error * FAN_GAIN + self._integral) * 100
+
+            if 0 < duty < 100:
+                self._integral += error * FAN_INTEGRAL_GAIN * step
+
+            self.fan_speed = int(max(0, min(100, duty)))
+        else:
+            self.fan_speed = 0
+            self._integral = 0.0
+
+        self.pit_temp += (HEAT_GAIN * self.fan_speed / 100 - HEAT_LOSS * (self.pit_temp - AMBIENT)) * step
+
+        for i, probe_temp in enumerate(self.probe_temps):
+            gain = PROBE_GAIN * (STALL_FACTOR if STALL_RANGE[0] <= probe_temp <= STALL_RANGE[1] else 1)
+            self.probe_temps[i] += gain * (self.pit_temp - probe_temp) * step
+
+    def info_body(self):
+        """Return the cgi-bin/info response body."""
+        return f"{MAC_ADDRESS}={self.mac}&{FW_VERSION}={self.fw_version}&{ENV}=prod"
+
+    def data_body(self):
+        """Return the cgi-bin/data response body."""
+        self.advance()
+        probes = [str(round(temp)) if plugged else UNPLUGGED for temp, plugged in zip(self.probe_temps, self._probes)]
+        values = {
+            UPTIME: self.device_time,
+            COOK_START: self.cook[COOK_START],
+            COOK_ID: self.cook[COOK_ID],
+            PIT_TEMP: round(self.pit_temp),
+            PROBE_1: probes[0],
+            PROBE_2: probes[1],
+            PROBE_3: probes[2],
+            FAN_SPEED: self.fan_speed,
+            TARGET_PIT_TEMP: self.cook[TARGET_PIT_TEMP],
+            COOK_END_TIME: self.cook[COOK_END_TIME],
+            FOOD_PROBE: self.cook[FOOD_PROBE],
+            TARGET_FOOD_TEMP: self.cook[TARGET_FOOD_TEMP],
+            UNKNOWN_RECEIVE_VAR1: 0,
+            UNKNOWN_RECEIVE_VAR2: 0,
+            UNKNOWN_RECEIVE_VAR3: 0,
+        }
+        return "&".join(f"{key}={value}" for key, value in values.items())
+
+    def apply_cook(self, body):
+        """Apply a cgi-bin/cook form body the way the controller does."""
+        self.advance()
+        payload = dict(parse_qsl(body, keep_blank_values=True))
+        self.commands.append((self.clock(), payload))
+
+        if CURRENT_TIME in payload:
+            self._clock_offset = int(payload[CURRENT_TIME]) - self.clock()
+            self.clock_skew = 0
+
+        for key in self.cook:
+            if key in payload:
+                self.cook[key] = payload[key] if key == COOK_ID else int(payload[key] or 0)
+
+    async def _handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it is closed or the device stops."""
+        self._connections[writer] = asyncio.current_task()
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = (await reader.readexactly(int(headers.get("content-length", 0)))).decode()
+
+                if self.refuse:
+                    break
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                if self.hang:
+                    await reader.read()
+                    break
+
+                status, response = self.handle(method, target.split("?", 1)[0], body)
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: text/plain\r\nContent-Length: {len(response)}\r\n\r\n".encode() + response.encode()
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.CancelledError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    def handle(self, method, path, body):
+        """Return the status and body answering a request."""
+        endpoint = path.rsplit("/", 1)[-1]
+
+        if not path.startswith("/cgi-bin/") or endpoint not in self.requests:
+            return 404, ""
+
+        self.requests[endpoint] += 1
+
+        if self.error_status is not None:
+            return self.error_status, ""
+        if endpoint == "info":
+            return 200, self.info_body()
+        if endpoint == "data":
+            return 200, self.data_body()
+        if method != "POST":
+            return 404, ""
+
+        self.apply_cook(body)
+        return 200, ""
+
+
+async def start_fleet(count, **kwargs):
+    """Start count simulated devices with distinct MAC addresses."""
+    fleet = [SimulatedDevice(mac=f"AA:BB:CC:DD:{i // 256:02X}:{i % 256:02X}", **kwargs) for i in range(count)]
+
+    for device in fleet:
+        await device.start()
+
+    return fleet
+
+
+async def main(count):
+    """Serve simulated devices until interrupted."""
+    fleet = await start_fleet(count)
+
+    for device in fleet:
+        print(f"{device.mac} listening on http://{device.host}/cgi-bin/")
+
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve simulated iKamand devices on localhost.")
+    parser.add_argument("--count", type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args.count))
+    except KeyboardInterrupt:
+        pass